@@ -2,8 +2,9 @@
 
 from rez.resolved_context import ResolvedContext as env
 from rez.packages_ import iter_packages as find
+from rez.packages_ import get_last_release_time
 from rez.package_copy import copy_package
-from rez.package_filter import Rule, PackageFilterList
+from rez.package_filter import Rule, PackageFilter, PackageFilterList
 from rez.package_repository import package_repository_manager
 from rez.packages_ import Package
 from rez.utils.formatting import PackageRequest
@@ -91,6 +92,7 @@ __all__ = [
     "find",
     "find_one",
     "find_latest",
+    "get_last_release_time",
     "config",
     "version",
     "project",
@@ -114,6 +116,7 @@ __all__ = [
 
     # Filters
     "Rule",
+    "PackageFilter",
     "PackageFilterList",
 
     # Extras
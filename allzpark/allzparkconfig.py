@@ -24,6 +24,59 @@ exclude_filter = "*.beta"
 # Where to go when clicking the logo
 help_url = "https://allzpark.com"
 
+# Number of applications resolved in parallel when changing profile.
+# Set to 1 to resolve one application at a time.
+resolve_threads = 4
+
+# Number of profile families scanned in parallel on reset
+scan_threads = 8
+
+# Number of recently loaded profiles kept in memory, for switching
+# back to them without resolving, and roughly how much memory they
+# may occupy in total, in megabytes.
+profile_cache_size = 5
+profile_cache_memory = 256
+
+# Once idle, load favorite profiles in the background such that
+# switching to one is instant. Prefetching waits this many seconds
+# of inactivity, uses this many threads and stops once recently
+# loaded profiles take up this many megabytes.
+prefetch_favorites = True
+prefetch_idle = 3.0
+prefetch_threads = 1
+prefetch_memory = 128
+
+# Start loading a profile once selected in the Profiles dock, or
+# hovered for this many seconds (0 to disable hovering), ahead of it
+# being activated. Only the most recent of these is loaded at a time,
+# on the threads used for prefetching.
+speculative_profiles = True
+speculative_hover = 0.5
+
+# Show the profiles and applications of the previous session on
+# launch, until they have been loaded anew.
+session_snapshot = True
+
+# With "Show all apps" enabled, list applications without resolving
+# them, and resolve each one once selected or launched instead.
+lazy_all_apps = True
+
+# Resolve applications using the versions resolved for their profile,
+# only considering other versions if an application needs them.
+pin_profile_resolve = True
+
+# Resolve patched applications in one go, rather than patching
+# their original resolve. Falls back to the latter whenever the
+# patch can't be applied up-front, or fails to resolve.
+patch_single_solve = True
+
+# Number of resolved contexts kept in `context_cache_location`,
+# the least recently used are removed first.
+context_cache_size = 1000
+
+# Number of lines kept in the console, older lines are discarded
+console_line_limit = 10000
+
 
 def profiles():
     """Return list of profiles
@@ -40,6 +93,18 @@ def profiles():
         return []
 
 
+def context_cache_location():
+    """Return directory in which to store resolved contexts
+
+    Contexts are re-used across sessions for as long as no package
+    involved in a resolve has been released since. Return an empty
+    string to always resolve from scratch.
+
+    """
+
+    return __os.path.expanduser("~/.allzpark/contexts")
+
+
 def applications():
     """Return list of applications
 
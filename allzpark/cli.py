@@ -240,9 +240,17 @@ def initialize(config_file=None,
                              "--clean to erase your previous settings and "
                              "start anew")
 
+        # Profiles and applications, as they were on exit
+        session_path = os.path.splitext(storage.fileName())[0] + ".session"
+
         if clean:
             tell("(clean) ")
             storage.clear()
+
+            try:
+                os.remove(session_path)
+            except OSError:
+                pass
         else:
             tell("(%s)" % storage.fileName())
 
@@ -260,6 +268,7 @@ def initialize(config_file=None,
             "rezLocalPath": config.local_packages_path.split(os.pathsep),
             "rezReleasePath": config.release_packages_path.split(os.pathsep),
             "settingsPath": storage.fileName(),
+            "sessionPath": session_path,
         }
 
         for key, value in defaults.items():
@@ -1,10 +1,12 @@
 """Orchestrates view.py and model.py"""
 
 import os
+import re
 import sys
 import time
 import json
 import errno
+import hashlib
 import shutil
 import logging
 import tempfile
@@ -33,6 +35,117 @@ Latest = model.Latest  # Enum
 NoVersion = model.NoVersion
 
 
+@util.cached(maxsize=1000)
+def _find_family(family, range_, paths):
+    """Return packages of `family` in human order
+
+    Cleared alongside the caches of Rez, whenever the
+    repository may have changed.
+
+    """
+
+    it = rez.find(family, range_, paths=list(paths))
+    return tuple(sorted(
+        it,
+
+        # Make e.g. 1.10 appear after 1.9
+        key=lambda p: util.natural_keys(str(p.version))
+    ))
+
+
+def _parse_patch(patch):
+    """Return requests of `patch` string per family name
+
+    Includes subtractions, e.g. '^foo', which aren't valid requests.
+
+    """
+
+    requests = odict()
+    for request in patch.split():
+        name = rez.PackageRequest(request.lstrip("^")).name
+        requests[name] = request
+    return requests
+
+
+def _mentioned_families(context):
+    """Return names of families `context` requests or resolves
+
+    Weak and conflicting references, such as those of a patch, only
+    count towards a successful resolve, which they had a say in.
+
+    """
+
+    names = set(pkg.name for pkg in context.resolved_packages or [])
+
+    # Those of a model.BrokenContext are plain strings
+    for request in context.requested_packages() or []:
+        request = rez.PackageRequest(str(request))
+
+        if not request.conflict or not context.success:
+            names.add(request.name)
+
+    return names
+
+
+def _blames(message, families):
+    """Return whether failure `message` names any of `families`
+
+    Packages are referenced by name, followed by either nothing or a
+    version, e.g. "lib", "lib-1" or "lib==3" but never "lib_extra".
+
+    """
+
+    return any(
+        re.search(r"(?<![\w.])%s(?![\w.])" % re.escape(name), message)
+        for name in families
+    )
+
+
+def _patch_request(request, patch):
+    """Return `request` with `patch` applied, without resolving it first
+
+    Mirrors `ResolvedContext.get_patched_request`, such that resolving
+    the result gives the same context as patching the resolve of `request`.
+
+    Arguments:
+        request (list): Original request, e.g. ["profile==1", "app==2"]
+        patch (dict): Patch per family, see `_parse_patch`
+
+    Returns:
+        list: Patched request, or None if `patch` can only be
+            interpreted relative the original resolve
+
+    """
+
+    requests = [rez.PackageRequest(str(req)) for req in request]
+
+    if any(req.startswith(".") for req in patch.values()):
+        # Ephemerals are only ever relative a resolve
+        return None
+
+    requests = [
+        req for req in requests
+        if not patch.get(req.name, "").startswith("^")
+    ]
+
+    for name, req in patch.items():
+        if req.startswith("^"):
+            continue
+
+        new = rez.PackageRequest(req)
+
+        for index, old in enumerate(requests):
+            if (old.name == new.name and
+                    old.conflict == new.conflict and
+                    old.weak == new.weak):
+                requests[index] = new
+                break
+        else:
+            requests.append(new)
+
+    return [str(req) for req in requests]
+
+
 class State(dict):
     """Transient, persistent and machine for state
 
@@ -62,9 +175,29 @@ class State(dict):
             # Previously loaded profile Rez packages
             "rezProfiles": {},
 
+            # Currently selected profile Rez package
+            "activeProfile": None,
+
+            # Context of the current profile on its own
+            "profileContext": None,
+
             # Currently loaded Rez contexts
             "rezContexts": {},
 
+            # Families of applications still being resolved
+            "pendingApps": set(),
+
+            # Applications of the profile are being resolved, and
+            # aren't all in place until each of them has been
+            "profileLoading": False,
+
+            # Requests of applications listed, but not yet resolved
+            "lazyApps": odict(),
+
+            # Profile and applications of the previous session,
+            # shown until loaded anew
+            "staleSession": None,
+
             # Cache, for performance only
             "rezEnvirons": {},
 
@@ -75,6 +208,11 @@ class State(dict):
             "testedEnvirons": {},
 
             "rezApps": odict(),
+
+            # Versions and release times of families used by the
+            # current profile, for detecting changes to the repository
+            "repositoryFingerprint": {},
+
             "fullCommand": "rez env",
             "serialisationMode": (
                 storage.value("serialisationMode") or "used_request"
@@ -121,6 +259,43 @@ class State(dict):
 
         return value
 
+    def last_used(self):
+        """Return when each application family was last launched
+
+        Returns:
+            dict: Seconds since epoch per family
+
+        """
+
+        last_used = dict()
+
+        # Called whilst resolving, off of the main thread. A group of
+        # the shared storage would apply to its calls meanwhile, so read
+        # from an instance of our own. Those of a process share changes.
+        storage = QtCore.QSettings(self._storage.fileName(),
+                                   self._storage.format())
+
+        storage.beginGroup("app")
+        for app_request in storage.childGroups():
+            family = app_request.split("==", 1)[0]
+            value = storage.value("%s/lastUsed" % app_request)
+
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+
+            last_used[family] = max(value, last_used.get(family, 0))
+
+        return last_used
+
+    def settle(self):
+        """Await user input, whilst applications may still be resolving"""
+        if self["pendingApps"] or self["profileLoading"]:
+            self.to_resolving()
+        else:
+            self.to_ready()
+
     def on_enter_booting(self):
         self._ctrl.debug("Booting..")
 
@@ -132,7 +307,7 @@ class State(dict):
 
     def on_enter_launching(self):
         self._ctrl.debug("Application is being launched..")
-        util.delay(self.to_ready, 500)
+        util.delay(self.settle, 500)
 
     def on_enter_noapps(self):
         profile = self["profileName"]
@@ -180,19 +355,247 @@ class _Stream(object):
         return
 
 
+class ContextCache(object):
+    """Resolved contexts on disk, re-used across sessions
+
+    Contexts are keyed by everything that goes into a resolve; requests,
+    package paths, package filter and implicit packages. A stored context
+    is considered valid for as long as no package family it involves has
+    seen a release more recent than the context itself, which is the same
+    guarantee `rez env --time` gives a context re-resolved at a later date.
+
+    Stale contexts are removed once found, and the least recently used
+    removed once there are more than `maxsize` of them.
+
+    Arguments:
+        root (str): Directory in which to store contexts, an empty
+            string disables the cache altogether
+        maxsize (int, optional): Maximum number of contexts,
+            None for unbounded
+
+    """
+
+    def __init__(self, root, maxsize=None):
+        self._root = root
+        self._maxsize = maxsize
+
+    def key(self, requests, paths, package_filter=None):
+        fingerprint = json.dumps([
+            [str(request) for request in requests],
+            list(paths),
+            str(package_filter) if package_filter else "",
+            list(rez.config.implicit_packages),
+        ])
+
+        return hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()
+
+    def get(self, key, paths):
+        if not self._root:
+            return None
+
+        fname = os.path.join(self._root, key + ".rxt")
+
+        if not os.path.exists(fname):
+            return None
+
+        try:
+            context = rez.env.load(fname)
+        except Exception:
+            # Stored by an incompatible version of Rez, or incomplete
+            return None
+
+        for package in context.resolved_packages or []:
+            released = rez.get_last_release_time(package.name, paths)
+
+            if not released or released > context.timestamp:
+                self._remove(fname)
+                return None
+
+        try:
+            # Most recently used, see `_prune`
+            os.utime(fname, None)
+        except OSError:
+            pass
+
+        return context
+
+    def put(self, key, context, paths):
+        if not self._root or not context.success:
+            return
+
+        for package in context.resolved_packages or []:
+            # Without a release time, we'd never know when to invalidate
+            if not rez.get_last_release_time(package.name, paths):
+                return
+
+        try:
+            os.makedirs(self._root)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                return
+
+        fname = os.path.join(self._root, key + ".rxt")
+        tmp = "%s.%s.tmp" % (fname, threading.current_thread().ident)
+
+        try:
+            context.save(tmp)
+
+            if os.path.exists(fname):
+                os.remove(fname)
+
+            os.rename(tmp, fname)
+
+        except (OSError, IOError):
+            # Another process may be writing the same context
+            self._remove(tmp)
+            return
+
+        self._prune()
+
+    def _prune(self):
+        if self._maxsize is None:
+            return
+
+        try:
+            fnames = [
+                os.path.join(self._root, fname)
+                for fname in os.listdir(self._root)
+                if fname.endswith(".rxt")
+            ]
+        except OSError:
+            return
+
+        if len(fnames) <= self._maxsize:
+            return
+
+        def last_used(fname):
+            try:
+                return os.path.getmtime(fname)
+            except OSError:
+                return 0
+
+        fnames.sort(key=last_used)
+
+        for fname in fnames[:len(fnames) - self._maxsize]:
+            self._remove(fname)
+
+    @staticmethod
+    def _remove(fname):
+        try:
+            os.remove(fname)
+        except OSError:
+            # Removed by another process, or never written
+            pass
+
+
+class RepositoryWatcher(QtCore.QObject):
+    """Notify about changes to package families on disk
+
+    Family directories are watched for new or removed versions, and
+    bursts of changes, such as during a release, are reported once
+    no further change has happened for `delay` milliseconds.
+
+    """
+
+    changed = QtCore.Signal(object)  # set of family names
+
+    def __init__(self, delay=2000, parent=None):
+        super(RepositoryWatcher, self).__init__(parent)
+
+        watcher = QtCore.QFileSystemWatcher(self)
+        watcher.directoryChanged.connect(self.on_directory_changed)
+
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(delay)
+        timer.timeout.connect(self.on_settled)
+
+        self._watcher = watcher
+        self._timer = timer
+        self._directories = {}  # directory -> family
+        self._changed = set()
+
+    @staticmethod
+    def directories(families, paths):
+        """Return existing directory per family, across `paths`
+
+        This is a filesystem query, and may be called from a thread.
+
+        """
+
+        directories = dict()
+
+        for path in paths:
+            for family in families:
+                directory = os.path.join(path, family)
+
+                if os.path.isdir(directory):
+                    directories[directory] = family
+
+        return directories
+
+    def watch(self, directories):
+        """Replace watched directories
+
+        Arguments:
+            directories (dict): Family name per directory, see `directories`
+
+        """
+
+        removed = set(self._directories) - set(directories)
+        added = set(directories) - set(self._directories)
+
+        if removed:
+            self._watcher.removePaths(list(removed))
+
+        if added:
+            self._watcher.addPaths(list(added))
+
+        self._directories = dict(directories)
+
+    def on_directory_changed(self, directory):
+        family = self._directories.get(directory)
+
+        if family is None:
+            return
+
+        self._changed.add(family)
+
+        # Keep postponing until changes have settled
+        self._timer.start()
+
+    def on_settled(self):
+        changed, self._changed = self._changed, set()
+
+        if changed:
+            self.changed.emit(changed)
+
+
 class Controller(QtCore.QObject):
     state_changed = QtCore.Signal(_State)
     logged = QtCore.Signal(str, int)  # message, level
     resetted = QtCore.Signal()
 
+    # Affected applications have been resolved anew, see `refresh`
+    refreshed = QtCore.Signal()
+
+    # Profile families scanned during reset
+    profiles_scanned = QtCore.Signal(int, int)  # scanned, total
+
     # One or more packages have changed on disk
-    repository_changed = QtCore.Signal()
+    repository_changed = QtCore.Signal(object)  # set of family names
 
     profile_changed = QtCore.Signal(
         str, object, bool)  # profile, version, refreshed
 
     application_changed = QtCore.Signal()
 
+    # The environment of an application has finished computing
+    environ_changed = QtCore.Signal(str)  # app request
+
+    # The environment of an application could not be computed
+    environ_failed = QtCore.Signal(str, str)  # app request, message
+
     # The current command to launch an application has changed
     command_changed = QtCore.Signal(str)  # command
 
@@ -242,11 +645,34 @@ class Controller(QtCore.QObject):
         }
 
         timers = {
-            "commandsPoller": QtCore.QTimer(self),
+            "clearCache": QtCore.QTimer(self),
+            "prefetch": QtCore.QTimer(self),
         }
 
-        timers["commandsPoller"].timeout.connect(self.on_tasks_polled)
-        timers["commandsPoller"].start(500)
+        pools = {
+            "resolve": util.Pool(allzparkconfig.resolve_threads),
+            "scan": util.Pool(allzparkconfig.scan_threads),
+            "prefetch": util.Pool(allzparkconfig.prefetch_threads),
+        }
+
+        cache = ContextCache(allzparkconfig.context_cache_location(),
+                             maxsize=allzparkconfig.context_cache_size)
+        watcher = RepositoryWatcher(parent=self)
+        watcher.changed.connect(self.on_families_changed)
+
+        models["commands"].running_changed.connect(
+            self.running_cmd_updated.emit)
+
+        timers["clearCache"].timeout.connect(self.on_cache_timeout)
+
+        timers["prefetch"].setSingleShot(True)
+        timers["prefetch"].setInterval(
+            int(allzparkconfig.prefetch_idle * 1000))
+        timers["prefetch"].timeout.connect(self.on_prefetch_timeout)
+
+        # Queued, as the state may change from within a thread
+        self.state_changed.connect(self.on_prefetch_state_changed,
+                                   type=QtCore.Qt.QueuedConnection)
 
         models["parentenv"].load(state["parentEnviron"].copy())
 
@@ -262,6 +688,29 @@ class Controller(QtCore.QObject):
         )
 
         self._timers = timers
+        self._pools = pools
+        self._generations = {
+            "profile": util.Generation(),
+            "application": util.Generation(),
+            "environ": util.Generation(),
+            "repository": util.Generation(),
+            "prefetch": util.Generation(),
+            "anticipate": util.Generation(),
+        }
+        self._cache = cache
+        self._watcher = watcher
+
+        # Lazily resolved applications, for the remainder of the session
+        self._lazy_contexts = dict()
+
+        # Resolves in progress, shared with anyone asking for the same
+        self._solves = util.SingleFlight()
+
+        # Recently loaded profiles, for switching back to them instantly
+        self._profiles = util.LRU(
+            maxsize=allzparkconfig.profile_cache_size,
+            maxcost=allzparkconfig.profile_cache_memory * 1024 ** 2,
+        )
         self._models = models
         self._storage = storage
         self._state = state
@@ -272,6 +721,8 @@ class Controller(QtCore.QObject):
 
         state.on_enter_booting()
 
+        self.set_cache_timeout()
+
     # ----------------
     # Data
     # ----------------
@@ -329,11 +780,7 @@ class Controller(QtCore.QObject):
               writing to disk or performing expensive calculations,
               such as resolving their own contexts for various reasons.
 
-        TODO: This should be async, the GUI should help the user
-              understand that the environment is loading and is
-              going to be ready soon. They should also only incur
-              cost when the user is actually looking at the
-              environment tab.
+        Use `request_environ` to compute it in the background.
 
         """
 
@@ -352,9 +799,55 @@ class Controller(QtCore.QObject):
             except rez.ResolvedContextError:
                 return model.BrokenContext.broken_dict.copy()
             else:
-                env[app_request] = environ
+                # Contexts may have been replaced whilst computing,
+                # e.g. by the user changing profile
+                if ctx.get(app_request) is context:
+                    env[app_request] = environ
+
                 return environ
 
+    @util.async_
+    def request_environ(self, app_request=None):
+        """Load environment of `app_request` into its model, once computed
+
+        Emits `environ_changed` once ready, immediately if
+        it has been computed before, or `environ_failed`.
+
+        Arguments:
+            app_request (str, optional): Defaults to current application
+
+        """
+
+        app_request = app_request or self._state["appRequest"]
+
+        def on_success(environ):
+            if app_request != self._state["appRequest"]:
+                return
+
+            self._models["environment"].load(environ)
+            self.environ_changed.emit(app_request)
+
+        def on_failure(error, trace):
+            self.error(trace)
+
+            if app_request != self._state["appRequest"]:
+                return
+
+            self.environ_failed.emit(app_request, str(error))
+
+        if app_request in self._state["rezEnvirons"]:
+            return on_success(self._state["rezEnvirons"][app_request])
+
+        util.defer(
+            self.environ,
+            args=[app_request],
+            on_success=on_success,
+            on_failure=on_failure,
+
+            # Only the most recently selected application is of interest
+            generation=self._generations["environ"],
+        )
+
     def resolved_packages(self, app_request):
         """Return context resolved packages and versions
 
@@ -395,14 +888,226 @@ class Controller(QtCore.QObject):
     # Events
     # ----------------
 
-    def on_tasks_polled(self):
-        running_count = self._models["commands"].poll()
-        self.running_cmd_updated.emit(running_count)
-
     def on_state_changed(self):
         state = self._name_to_state[self._state.state]
         self.state_changed.emit(state)
 
+    def on_prefetch_state_changed(self, state):
+        if state == "ready":
+            self._timers["prefetch"].start()
+        else:
+            self.interrupt_prefetch()
+
+    def on_prefetch_timeout(self):
+        """Load the next favorite profile not yet loaded, in the background
+
+        One profile at a time, for as long as the user remains idle and
+        recently loaded profiles are within `allzparkconfig.prefetch_memory`.
+        Leaves room for at least one profile loaded by the user.
+
+        """
+
+        if not allzparkconfig.prefetch_favorites:
+            return
+
+        if self._state.state != "ready":
+            return
+
+        if (self._profiles.cost() >=
+                allzparkconfig.prefetch_memory * 1024 ** 2 or
+                len(self._profiles) >=
+                allzparkconfig.profile_cache_size - 1):
+            return
+
+        current = self._state["profileName"]
+        profile = key = None
+
+        for name in sorted(self._models["profiles"].favorites):
+            if name == current or name not in self._state["rezProfiles"]:
+                continue
+
+            profile = self._state["rezProfiles"][name][Latest]
+
+            if isinstance(profile, model.BrokenPackage):
+                continue
+
+            key = self._profile_key(profile)
+
+            if key not in self._profiles:
+                break
+
+        else:
+            return
+
+        self.debug("Prefetching %s.." % profile.name)
+        self._preload_profile(profile,
+                              generation=self._generations["prefetch"],
+                              then=self.on_prefetch_timeout)
+
+    def anticipate_profile(self, profile_name):
+        """Start loading `profile_name`, as it is likely to be selected next
+
+        Only the most recently anticipated profile is loaded, any prior
+        one is cancelled in between applications.
+
+        """
+
+        if not allzparkconfig.speculative_profiles:
+            return
+
+        if self._state.state != "ready":
+            return
+
+        if profile_name == self._state["profileName"]:
+            return
+
+        try:
+            profile = self._state["rezProfiles"][profile_name][Latest]
+        except KeyError:
+            return
+
+        if isinstance(profile, model.BrokenPackage):
+            return
+
+        if self._profile_key(profile) in self._profiles:
+            return
+
+        self.debug("Anticipating %s.." % profile_name)
+        self._preload_profile(profile,
+                              generation=self._generations["anticipate"])
+
+    def _preload_profile(self, profile, generation, then=None):
+        """Load `profile` in the background, for `select_profile` to restore
+
+        Arguments:
+            profile (rez.Package): Profile to load
+            generation (util.Generation): Cancel prior loads of this kind
+            then (callable, optional): Call once loaded
+
+        """
+
+        key = self._profile_key(profile)
+
+        def do(cancelled):
+            qualified_profile_name, profile_context, requests = (
+                self._list_apps(profile)
+            )
+
+            lazy_apps = odict()
+
+            if (self._state.retrieve("showAllApps") and
+                    allzparkconfig.lazy_all_apps):
+                apps, lazy_apps, rez_apps = self._list_lazy_apps(requests)
+                contexts = odict()
+
+            else:
+                apps, contexts, rez_apps, _ = self._resolve_apps(
+                    qualified_profile_name,
+                    requests,
+                    profile_context,
+                    cancelled=cancelled,
+                    pool=self._pools["prefetch"],
+                )
+
+            families = self._relevant_families(profile.name,
+                                               contexts,
+                                               rez_apps)
+
+            return {
+                "apps": apps,
+                "repositoryFingerprint":
+                    self._repository_fingerprint(families),
+                "profileContext": profile_context,
+                "rezContexts": contexts,
+                "rezApps": rez_apps,
+                "rezEnvirons": odict(),
+                "testedEnvirons": odict(),
+                "lazyApps": lazy_apps,
+            }
+
+        def on_success(snapshot):
+            self.debug("Loaded %s in the background" % profile.name)
+            self._profiles.put(key, snapshot, self._snapshot_cost(snapshot))
+
+            if then is not None:
+                then()
+
+        def on_failure(error, trace):
+            if isinstance(error, util.Cancelled):
+                return
+
+            self.debug("Could not load %s: %s" % (profile.name, error))
+
+        # Background loads, profile and applications alike, only
+        # ever occupy threads of their own and never those of the
+        # foreground. Applications are resolved one after another,
+        # on whichever of these threads is loading their profile.
+        util.defer(do,
+                   on_success=on_success,
+                   on_failure=on_failure,
+                   generation=generation,
+                   cancellable=True,
+                   pool=self._pools["prefetch"])
+
+    def interrupt_prefetch(self):
+        """Stop prefetching, and start over once idle again"""
+
+        self._generations["prefetch"].replace(None)
+        self._timers["prefetch"].stop()
+
+        if self._state.state == "ready":
+            self._timers["prefetch"].start()
+
+    def on_cache_timeout(self):
+        """Clear repository caches, and look for changes to the repository
+
+        Only families relevant to the current profile are considered,
+        and `repository_changed` only emitted if any of them changed.
+
+        """
+
+        if self._state.state != "ready":
+            return
+
+        previous = self._state["repositoryFingerprint"]
+
+        if not previous:
+            return
+
+        def do():
+            rez.clear_caches()
+            util.clear_caches()
+            return self._repository_fingerprint(previous)
+
+        def on_success(fingerprint):
+            changed = sorted(
+                family for family in fingerprint
+                if fingerprint[family] != previous.get(family)
+            )
+
+            if changed:
+                self.debug("Repository changed: %s" % ", ".join(changed))
+                self._state["repositoryFingerprint"] = fingerprint
+                self.repository_changed.emit(set(changed))
+
+        def on_failure(error, trace):
+            self.debug(trace)
+
+        util.defer(do,
+                   on_success=on_success,
+                   on_failure=on_failure,
+                   generation=self._generations["repository"])
+
+    def on_families_changed(self, families):
+        self.debug("Packages changed on disk: %s"
+                   % ", ".join(sorted(families)))
+
+        # Pick up the new listing of each family
+        rez.clear_caches()
+        util.clear_caches()
+
+        self.repository_changed.emit(families)
+
     def on_unhandled_exception(self, type, value, tb):
         """From sys.excepthook
 
@@ -505,6 +1210,10 @@ class Controller(QtCore.QObject):
             self._state["error"] = message % value
             self._state.to_noapps()
 
+            # Formatted for the "noapps" page, rather than the console
+            self.error(util.html_to_text(self._state["error"]))
+            return
+
         self.error(self._state["error"])
 
     # ----------------
@@ -525,22 +1234,15 @@ class Controller(QtCore.QObject):
 
         package_filter = self._package_filter()
         paths = self._package_paths()
-        it = rez.find(family, range_, paths=paths)
-        it = sorted(
-            it,
 
-            # Make e.g. 1.10 appear after 1.9
-            key=lambda p: util.natural_keys(str(p.version))
-        )
-
-        for pkg in it:
+        for pkg in _find_family(family, range_, tuple(paths)):
             if package_filter.excludes(pkg):
                 self.debug("Excluding %s==%s.." % (pkg.name, pkg.version))
                 continue
 
             yield pkg
 
-    def env(self, requests, use_filter=True):
+    def env(self, requests, use_filter=True, pins=None):
         """Resolve context, relative Allzpark state
 
         Arguments:
@@ -548,17 +1250,45 @@ class Controller(QtCore.QObject):
                 number of packages. E.g. "six==1.2 PySide2"
             use_filter (bool, optional): Whether or not to apply
                 the current package_filter
+            pins (list, optional): Packages whose family is limited
+                to only their version
 
         """
 
-        package_filter = self._package_filter()
+        package_filter = self._package_filter() if use_filter else None
+
+        if pins:
+            pinned = rez.PackageFilter()
+            for pkg in pins:
+                pinned.add_exclusion(rez.Rule.parse_rule(pkg.name))
+                pinned.add_inclusion(rez.Rule.parse_rule(
+                    "%s==%s" % (pkg.name, pkg.version)))
+
+            package_filter = package_filter or rez.PackageFilterList()
+            package_filter.add_filter(pinned)
         paths = self._package_paths()
 
-        return rez.env(
-            requests,
-            package_paths=paths,
-            package_filter=package_filter if use_filter else None
-        )
+        key = self._cache.key(requests, paths, package_filter)
+
+        def solve():
+            context = self._cache.get(key, paths)
+
+            if context is not None:
+                return context
+
+            context = rez.env(
+                requests,
+                package_paths=paths,
+                package_filter=package_filter
+            )
+
+            self._cache.put(key, context, paths)
+
+            return context
+
+        # Profiles, patches and background loads may all ask for
+        # the same context at once, leave it to whoever asked first
+        return self._solves.do(key, solve)
 
     def update_command(self, mode=None):
         if mode:
@@ -639,15 +1369,38 @@ class Controller(QtCore.QObject):
 
         self._state.to_booting()
 
+        # Show what was there last time, whilst loading on first launch
+        if not self._state["rezProfiles"]:
+            self._restore_session()
+
         def do():
             profiles = dict()
             default_profile = None
 
-            for name in self.list_profiles(root):
+            names = list(self.list_profiles(root))
+            scanned = {"count": 0}
+            lock = threading.Lock()
+
+            def _scan(name):
+                packages = list(self.find(name))
+
+                # Emitted whilst locked, for counts to arrive in order
+                with lock:
+                    scanned["count"] += 1
+                    self.profiles_scanned.emit(scanned["count"], len(names))
+
+                return packages
+
+            self.profiles_scanned.emit(0, len(names))
+
+            # Families are scanned concurrently, but kept in order
+            results = self._pools["scan"].map(_scan, names)
+
+            for name, packages in zip(names, results):
 
                 # Find profile package
                 package = None
-                for package in self.find(name):
+                for package in packages:
 
                     if name not in profiles:
                         profiles[name] = dict()
@@ -714,6 +1467,9 @@ class Controller(QtCore.QObject):
         # This function clears the in-memory cache,
         # so that we can pick up new packages.
         rez.clear_caches()
+        util.clear_caches()
+        self._lazy_contexts.clear()
+        self._profiles.clear()
 
         self._state.to_loading()
         util.defer(
@@ -722,28 +1478,185 @@ class Controller(QtCore.QObject):
             on_failure=_on_failure
         )
 
+    @util.async_
+    def refresh(self, families):
+        """Re-resolve only applications affected by `families`
+
+        Contexts which neither request nor resolve any of `families`
+        are kept as-is, along with their environments. Changes to
+        profiles, or refreshing whilst busy, result in a full reset.
+
+        Arguments:
+            families (set): Names of package families that have changed
+
+        """
+
+        families = set(families)
+
+        if self._state.state != "ready" or (
+                families & set(self._state["rezProfiles"])):
+            return self.reset()
+
+        affected = odict()  # family -> app request
+        for app_request, context in self._state["rezContexts"].items():
+            family = app_request.split("==", 1)[0]
+            mentioned = set([family])
+            mentioned.update(_mentioned_families(context))
+
+            if mentioned & families:
+                affected[family] = app_request
+
+        if not affected:
+            self.debug("No application affected by %s"
+                       % ", ".join(sorted(families)))
+            return self.refreshed.emit()
+
+        self.info("Refreshing %s.." % ", ".join(affected))
+
+        # Pick up new versions of changed families
+        rez.clear_caches()
+        util.clear_caches()
+        self._lazy_contexts.clear()
+
+        profile = self._state["activeProfile"]
+
+        def do(cancelled):
+            requests = [
+                request for request in self._app_requests(profile)
+                if rez.PackageRequest(request.strip("~")).name in affected
+            ]
+
+            qualified_profile_name = self._qualified_profile_name(profile)
+            profile_context = self.env([qualified_profile_name])
+
+            return self._resolve_apps(
+                qualified_profile_name, requests, profile_context,
+                cancelled=cancelled
+            )
+
+        def on_success(result):
+            apps, contexts, rez_apps, startup_app = result
+            self._update_apps(affected, apps, contexts, rez_apps)
+
+            if startup_app:
+                self._state.store("startupApplication", startup_app)
+
+            self._survey_repository()
+            self._state.to_ready()
+            self.refreshed.emit()
+
+        def on_failure(error, trace):
+            raise error
+
+        self._state.to_loading()
+        util.defer(do,
+                   on_success=on_success,
+                   on_failure=on_failure,
+                   generation=self._generations["profile"],
+                   cancellable=True)
+
+    def _update_apps(self, previous, apps, contexts, rez_apps):
+        """Replace applications in place, keeping the order of each
+
+        Arguments:
+            previous (dict): Previous app request per family
+            apps (dict): Visible applications, see `_resolve_apps`
+            contexts (dict): Context per new app request
+            rez_apps (dict): Package per new app request
+
+        """
+
+        replaced = dict()  # previous app request -> new app request
+        for app_request in contexts:
+            family = app_request.split("==", 1)[0]
+            replaced[previous.get(family, app_request)] = app_request
+
+        for state_key, values in (("rezContexts", contexts),
+                                  ("rezApps", rez_apps)):
+            updated = odict()
+
+            for app_request, value in self._state[state_key].items():
+                new_request = replaced.get(app_request)
+
+                if new_request is None:
+                    updated[app_request] = value
+                else:
+                    updated[new_request] = values[new_request]
+
+            self._state[state_key] = updated
+
+        for old_request, new_request in replaced.items():
+            self._state["rezEnvirons"].pop(old_request, None)
+            self._state["testedEnvirons"].pop(old_request, None)
+            self._models["apps"].update(old_request,
+                                        new_request,
+                                        apps.get(new_request))
+
+        current = replaced.get(self._state["appRequest"])
+        if current in apps:
+            self.select_application(current, refresh=True)
+
     def patch(self, new):
         self.debug("Patching %s.." % new)
 
         new = rez.PackageRequest(new)
-        old = odict(
-            (rez.PackageRequest(req).name, rez.PackageRequest(req))
-            for req in self._state.retrieve("patch", "").split()
-        )
+        old = _parse_patch(self._state.retrieve("patch", ""))
 
         if new.name in old:
             old.pop(new.name)
 
         if str(new.range):
             # Otherwise, let it return to the originally resolved value
-            old[new.name] = new
+            old[new.name] = str(new)
 
-        patch = " ".join(str(pkg) for pkg in old.values())
-        self._state.store("patch", patch)
-        self.reset()
+        self.set_patch(" ".join(old.values()))
+
+    def set_patch(self, patch):
+        """Apply `patch` to the applications it affects
+
+        Packages of a patch are added to every application, such that
+        every context is resolved anew, unless the patch only gained
+        subtractions. Those leave contexts without the subtracted
+        family be.
+
+        Arguments:
+            patch (str): Full patch, e.g. "foo==1 ^bar"
+
+        """
+
+        old = _parse_patch(self._state.retrieve("patch", ""))
+        new = _parse_patch(patch)
+
+        changed = set(
+            name for name in set(old) | set(new)
+            if old.get(name) != new.get(name)
+        )
+
+        self._state.store("patch", " ".join(new.values()))
+        self.patch_changed.emit(self._state.retrieve("patch"))
+
+        subtracted = set(
+            name for name in changed
+            if new.get(name, "").startswith("^")
+        )
+
+        if changed - subtracted:
+            changed.update(app_request.split("==", 1)[0]
+                           for app_request in self._state["rezContexts"])
+
+        if changed:
+            self.refresh(changed)
+        else:
+            self.refreshed.emit()
 
     @util.async_
     def launch(self, **kwargs):
+        app_request = self._state["appRequest"]
+
+        if self._is_lazy(app_request):
+            return self._resolve_lazily(app_request,
+                                        then=lambda: self.launch(**kwargs))
+
         def do():
             app_request = self._state["appRequest"]
             rez_context = self._state["rezContexts"][app_request]
@@ -796,11 +1709,12 @@ class Controller(QtCore.QObject):
             cmd.stderr.connect(stderr)
             cmd.error.connect(on_error)
 
-            cmd.execute()
-
+            # Track status prior to executing, so as to not miss it starting
             self._state["commands"].append(cmd)
             self._models["commands"].append(cmd)
 
+            cmd.execute()
+
             self._state.store("app/%s/lastUsed" % app_request, time.time())
             self._state.to_launching()
 
@@ -833,7 +1747,7 @@ class Controller(QtCore.QObject):
                 shutil.rmtree(tempdir)
 
         def on_success(result=None):
-            self.repository_changed.emit()
+            self.repository_changed.emit(set([name]))
 
         def on_failure(error, trace):
             self.error(trace)
@@ -850,7 +1764,7 @@ class Controller(QtCore.QObject):
             localz.delocalize(package)
 
         def on_success(result=None):
-            self.repository_changed.emit()
+            self.repository_changed.emit(set([name]))
 
         def on_failure(error, trace):
             self.error(trace)
@@ -902,23 +1816,111 @@ class Controller(QtCore.QObject):
 
         return profiles
 
-    @util.async_
-    def select_profile(self, profile_name, version_name=Latest):
+    @util.async_
+    def select_profile(self, profile_name, version_name=Latest):
+
+        # Keep the outgoing profile around, in case we're coming back
+        outgoing = self._remember_profile()
+
+        stale = self._state["staleSession"]
+        self._state["staleSession"] = None
+
+        # Wipe existing data
+        if not stale:
+            self._models["apps"].reset()
+        self._models["context"].reset()
+        self._models["environment"].reset()
+        self._models["diagnose"].reset()
+        self._models["packages"].reset()
+        self._models["profileVersions"].setStringList([])
+
+        self._state["rezContexts"].clear()
+        self._state["rezEnvirons"].clear()
+        self._state["testedEnvirons"].clear()
+        self._state["rezApps"].clear()
+        self._state["pendingApps"].clear()
+        self._state["profileLoading"] = False
+        self._state["lazyApps"] = odict()
+
+        # Drop lazily resolved applications of the previous profile
+        self._generations["application"].replace(None)
+
+        def on_apps_listed(result):
+            qualified_profile_name, profile_context, requests = result
+            self._state["profileContext"] = profile_context
+
+            if not requests:
+                self._models["apps"].reset()
+                return on_apps_found((None, None, None, None))
+
+            if (self._state.retrieve("showAllApps") and
+                    allzparkconfig.lazy_all_apps):
+                return util.defer(
+                    self._list_lazy_apps,
+                    args=[requests],
+                    on_success=on_apps_lazily_listed,
+                    on_failure=on_apps_not_found,
+                    generation=self._generations["profile"],
+                )
+
+            families = [
+                rez.PackageRequest(request.strip("~")).name
+                for request in requests
+            ]
+
+            # Applications appear one by one, as they finish resolving
+            self._state["pendingApps"].update(families)
+            self._state["profileLoading"] = True
+
+            if stale:
+                # Replaced one by one too, leaving unaffected rows be
+                self._models["apps"].reconcile(families)
+            else:
+                self._models["apps"].reset(pending=families)
+            self._state.to_resolving()
+
+            util.defer(
+                self._resolve_apps,
+                args=[qualified_profile_name, requests, profile_context],
+                on_success=on_apps_found,
+                on_failure=on_apps_not_found,
+                on_progress=on_app_resolved,
+                generation=self._generations["profile"],
+
+                # Stop resolving once another profile is selected
+                cancellable=True,
+            )
+
+        def on_apps_lazily_listed(result):
+            apps, lazy_apps, rez_apps = result
+
+            # Resolved once selected, see `select_application`
+            self._state["lazyApps"] = lazy_apps
+            on_apps_found((apps, odict(), rez_apps, None))
+            self._models["apps"].reset(apps)
+
+        def on_app_resolved(result):
+            family, app_request, context, rez_pkg, data = result
+
+            self._state["rezContexts"][app_request] = context
+            self._state["rezApps"][app_request] = rez_pkg
+            self._state["pendingApps"].discard(family)
+            self._models["apps"].update(family, app_request, data)
+
+        def on_apps_found(result):
+            apps, contexts, rez_apps, startup_app = result
+
+            # Replace what was streamed, in the order of the profile
+            self._state["pendingApps"].clear()
+            self._state["profileLoading"] = False
+            self._state["rezContexts"] = contexts or odict()
+            self._state["rezApps"] = rez_apps or odict()
 
-        # Wipe existing data
-        self._models["apps"].reset()
-        self._models["context"].reset()
-        self._models["environment"].reset()
-        self._models["diagnose"].reset()
-        self._models["packages"].reset()
-        self._models["profileVersions"].setStringList([])
+            if startup_app:
+                self._state.store("startupApplication", startup_app)
 
-        self._state["rezContexts"].clear()
-        self._state["rezEnvirons"].clear()
-        self._state["testedEnvirons"].clear()
-        self._state["rezApps"].clear()
+            self._survey_repository()
 
-        def on_apps_found(apps):
             if not apps:
                 self._state["error"] = """
                 <h2><font color=\"red\">:(</font></h2>
@@ -939,10 +1941,11 @@ class Controller(QtCore.QObject):
                 self._state.to_noapps()
 
             else:
-                self._models["apps"].reset(apps)
                 self._state.to_ready()
 
         def on_apps_not_found(error, trace):
+            self._state["profileLoading"] = False
+
             # Handled by on_unhandled_exception
             raise error
 
@@ -963,6 +1966,11 @@ class Controller(QtCore.QObject):
             else:
                 self.error("select_profile was passed an empty string")
 
+        if stale and (stale["profileName"], stale["profileVersion"]) != (
+                profile_name, str(active_profile.version)):
+            stale = None
+            self._models["apps"].reset()
+
         refreshed = self._state["profileName"] == profile_name
 
         # TODO: This isn't clear.
@@ -973,6 +1981,7 @@ class Controller(QtCore.QObject):
         version_name = str(version_name) if version_name else NoVersion
 
         self._state["profileName"] = profile_name
+        self._state["activeProfile"] = active_profile
         self.profile_changed.emit(
             profile_name,
             version_name,
@@ -989,20 +1998,199 @@ class Controller(QtCore.QObject):
         versions.reverse()  # Latest first
         self._models["profileVersions"].setStringList(versions)
 
+        # Selecting the current profile again loads it anew
+        key = self._profile_key(active_profile)
+        snapshot = self._profiles.get(key) if key != outgoing else None
+
+        if snapshot is not None:
+            return self._restore_profile(snapshot)
+
         self._state.to_loading()
         util.defer(
             self._list_apps,
             args=[active_profile],
-            on_success=on_apps_found,
+            on_success=on_apps_listed,
             on_failure=on_apps_not_found,
+
+            # Drop results of any profile selected prior to this one
+            generation=self._generations["profile"],
+        )
+
+    def save_session(self):
+        """Store profiles and applications, for `reset` on next launch"""
+
+        path = self._state.retrieve("sessionPath")
+        profile = self._state["activeProfile"]
+
+        if (not path or
+                not allzparkconfig.session_snapshot or
+                self._state.state != "ready" or
+                profile is None or
+                isinstance(profile, model.BrokenPackage)):
+            return
+
+        session = {
+            "packagesPath": self._package_paths(),
+            "profileName": self._state["profileName"],
+            "profileVersion": str(profile.version),
+            "profiles": self._models["profiles"].snapshot(),
+            "apps": self._models["apps"].snapshot(),
+        }
+
+        try:
+            with open(path, "w") as f:
+                json.dump(session, f, indent=2, sort_keys=True)
+
+        except (IOError, OSError) as e:
+            self.warning("Could not store session in %s: %s" % (path, e))
+
+    def _restore_session(self):
+        """Show profiles and applications stored by `save_session`
+
+        Only applications of the startup profile are shown, and only
+        until they are resolved anew via `select_profile`.
+
+        """
+
+        path = self._state.retrieve("sessionPath")
+
+        if not path or not allzparkconfig.session_snapshot:
+            return
+
+        try:
+            with open(path) as f:
+                session = json.load(f)
+
+        except (IOError, OSError):
+            # No previous session
+            return
+
+        except ValueError as e:
+            self.warning("Ignoring session %s: %s" % (path, e))
+            return
+
+        if session.get("packagesPath") != self._package_paths():
+            return
+
+        if session.get("profileName") != self._state["profileName"]:
+            return
+
+        self.debug("Restoring session from %s.." % path)
+
+        self._models["profiles"].set_favorites(self)
+        self._models["profiles"].set_current(session["profileName"])
+        self._models["profiles"].restore(session["profiles"])
+        self._models["apps"].restore(session["apps"])
+        self._state["staleSession"] = session
+
+    def _profile_key(self, profile):
+        """Return everything a loaded profile depends on"""
+        return (
+            self._qualified_profile_name(profile),
+            self._state.retrieve("patch", ""),
+            self._state.retrieve("patchWithFilter", False),
+            self._state.retrieve("showAllApps", False),
+            self._state.retrieve("showHiddenApps", False),
+            tuple(self._package_paths()),
+            str(self._package_filter()),
+        )
+
+    def _remember_profile(self):
+        """Store the current profile, once fully loaded
+
+        Returns:
+            key (tuple): Of the stored profile, or None
+
+        """
+        profile = self._state["activeProfile"]
+
+        if (profile is None or
+                isinstance(profile, model.BrokenPackage) or
+                self._state.state != "ready" or
+                not self._state["rezContexts"]):
+            return
+
+        snapshot = {
+            "apps": odict(
+                (item["name"], {"package": item["package"],
+                                "versions": item["versions"]})
+                for item in self._models["apps"].items
+            ),
+            "repositoryFingerprint": self._state["repositoryFingerprint"],
+            "profileContext": self._state["profileContext"],
+        }
+
+        for key in ("rezContexts",
+                    "rezApps",
+                    "rezEnvirons",
+                    "testedEnvirons",
+                    "lazyApps"):
+            snapshot[key] = odict(self._state[key])
+
+        key = self._profile_key(profile)
+        self._profiles.put(key, snapshot, self._snapshot_cost(snapshot))
+
+        return key
+
+    def _snapshot_cost(self, snapshot):
+        """Return roughly how many bytes `snapshot` occupies"""
+
+        # Environments are the bulk of what is kept,
+        # alongside a few kilobytes per resolved package
+        cost = sum(
+            len(key) + len(value)
+            for environ in snapshot["rezEnvirons"].values()
+            for key, value in environ.items()
+        )
+        cost += sum(
+            4096 * len(context.resolved_packages or [])
+            for context in snapshot["rezContexts"].values()
         )
 
-    def select_application(self, app_request):
+        return cost
+
+    def _restore_profile(self, snapshot):
+        """Bring back a profile stored by `_remember_profile`
+
+        Its applications are looked at anew in the background, and
+        `repository_changed` emitted for anything that has changed since.
+
+        """
+
+        self.debug("Restoring %s.." % self._state["profileName"])
+
+        # Whatever was loading before us is no longer of interest
+        self._generations["profile"].replace(None)
+
+        for key in ("rezContexts",
+                    "rezApps",
+                    "rezEnvirons",
+                    "testedEnvirons",
+                    "lazyApps"):
+            self._state[key] = odict(snapshot[key])
+
+        self._state["profileContext"] = snapshot["profileContext"]
+        self._state.to_ready()
+        self._models["apps"].reset(snapshot["apps"])
+        self._survey_repository(previous=snapshot["repositoryFingerprint"])
+
+    def select_application(self, app_request, refresh=False):
+        """Make `app_request` the current application
+
+        Arguments:
+            app_request (str): E.g. "maya==2018"
+            refresh (bool, optional): Only update packages that have
+                changed since last selected, e.g. after a re-resolve
+
+        """
+
+        if self._is_lazy(app_request):
+            return self._resolve_lazily(app_request)
+
         self._state["appRequest"] = app_request
 
         try:
             context = self.context(app_request)
-            environ = self.environ(app_request)
             packages = self.resolved_packages(app_request)
             diagnose = self._state["testedEnvirons"].get(app_request, {})
 
@@ -1013,9 +2201,13 @@ class Controller(QtCore.QObject):
             self._models["diagnose"].reset()
             raise
 
-        self._models["packages"].reset(packages)
+        if refresh:
+            self._models["packages"].update(packages)
+        else:
+            self._models["packages"].reset(packages)
+
         self._models["context"].load(context.to_dict())
-        self._models["environment"].load(environ)
+        self._models["environment"].reset()  # See request_environ
         self._models["diagnose"].load(diagnose)
 
         tools = self._models["apps"].find(app_request)["tools"]
@@ -1031,12 +2223,185 @@ class Controller(QtCore.QObject):
         else:
             self._state.to_appfailed()
 
-        self._state.to_ready()
+        self._state.settle()
+
+    def _is_lazy(self, app_request):
+        return (app_request in self._state["lazyApps"] and
+                app_request not in self._state["rezContexts"])
+
+    def _resolve_lazily(self, app_request, then=None):
+        """Resolve an application listed by `_list_lazy_apps` and select it
+
+        Arguments:
+            app_request (str): Listed application, e.g. "maya==2018"
+            then (callable, optional): Call once selected
+
+        """
+
+        request = self._state["lazyApps"][app_request]
+        profile = self._state["activeProfile"]
+        qualified_profile_name = self._qualified_profile_name(profile)
+
+        key = (
+            qualified_profile_name,
+            request,
+            self._state.retrieve("patch", ""),
+            self._state.retrieve("patchWithFilter", False),
+            tuple(self._package_paths()),
+            str(self._package_filter()),
+        )
+
+        self._state["appRequest"] = app_request
+        self._models["packages"].reset()
+        self._models["context"].reset()
+        self._models["environment"].reset()
+        self._models["diagnose"].reset()
+
+        def do():
+            return self._resolve_apps(qualified_profile_name, [request],
+                                      self._state["profileContext"])
+
+        def on_success(result):
+            self._lazy_contexts[key] = result
+            apps, contexts, rez_apps, _ = result
+            new_request = next(iter(contexts))
+
+            self._state["rezContexts"][new_request] = contexts[new_request]
+            self._state["rezApps"].pop(app_request, None)
+            self._state["rezApps"][new_request] = rez_apps[new_request]
+            self._models["apps"].update(app_request,
+                                        new_request,
+                                        apps.get(new_request))
+
+            if self._state["appRequest"] != app_request:
+                return  # The user moved on
+
+            if new_request in apps:
+                self.select_application(new_request)
+            else:
+                self._state.settle()
+
+            if then is not None:
+                then()
+
+        def on_failure(error, trace):
+            raise error
+
+        if key in self._lazy_contexts:
+            return on_success(self._lazy_contexts[key])
+
+        self.debug("Resolving %s.." % app_request)
+        self._state.to_resolving()
+        util.defer(do,
+                   on_success=on_success,
+                   on_failure=on_failure,
+                   generation=self._generations["application"])
 
     def select_tool(self, tool_name):
         self._state["tool"] = tool_name
         self.update_command()
 
+    def _survey_repository(self, previous=None):
+        """Fingerprint and watch families relevant to the current profile
+
+        Arguments:
+            previous (dict, optional): Emit `repository_changed` for
+                families whose fingerprint differs from this one
+
+        """
+
+        self._state["repositoryFingerprint"] = {}
+        families = self._relevant_families(self._state["profileName"],
+                                           self._state["rezContexts"],
+                                           self._state["rezApps"])
+
+        # Watch profiles too, for new versions of any of them
+        watched = families | set(self._state["rezProfiles"])
+
+        def survey():
+            if previous is not None:
+                rez.clear_caches()
+
+            return (
+                self._repository_fingerprint(families),
+                self._watcher.directories(watched, self._package_paths()),
+            )
+
+        def on_surveyed(result):
+            fingerprint, directories = result
+            self._state["repositoryFingerprint"] = fingerprint
+            self._watcher.watch(directories)
+
+            changed = set(
+                family for family in fingerprint
+                if previous is not None
+                and fingerprint[family] != previous.get(family)
+            )
+
+            if changed:
+                self.debug("Repository changed: %s"
+                           % ", ".join(sorted(changed)))
+                self.repository_changed.emit(changed)
+
+        util.defer(survey,
+                   on_success=on_surveyed,
+                   generation=self._generations["repository"])
+
+    def set_cache_timeout(self, seconds=None):
+        """Clear repository caches every `seconds`, 0 to disable
+
+        Arguments:
+            seconds (int, optional): Defaults to the stored preference
+
+        """
+
+        timer = self._timers["clearCache"]
+        timer.stop()
+
+        if seconds is None:
+            # Not `retrieve`, which would read e.g. "2" as True
+            seconds = self._storage.value("clearCacheTimeout", 10)
+
+        # Stored as text
+        seconds = int(seconds or 0)
+
+        if seconds:
+            timer.start(seconds * 1000)
+
+    def _relevant_families(self, profile_name, contexts, rez_apps):
+        """Return names of families a profile and its applications use"""
+
+        families = set([profile_name])
+        families.update(pkg.name for pkg in rez_apps.values())
+
+        for context in contexts.values():
+            families.update(
+                pkg.name for pkg in context.resolved_packages or []
+                if not isinstance(pkg, model.BrokenPackage)
+            )
+
+        return families
+
+    def _repository_fingerprint(self, families):
+        """Return versions and last release time of each family
+
+        Arguments:
+            families (iterable): Names of package families
+
+        """
+
+        paths = self._package_paths()
+        fingerprint = dict()
+
+        for family in families:
+            versions = tuple(sorted(
+                str(pkg.version) for pkg in rez.find(family, paths=paths)
+            ))
+            released = rez.get_last_release_time(family, paths)
+            fingerprint[family] = (versions, released)
+
+        return fingerprint
+
     def _package_paths(self):
         """Return all package paths, relative the current state of the world"""
 
@@ -1059,36 +2424,49 @@ class Controller(QtCore.QObject):
         return paths
 
     def _list_apps(self, profile):
-        # Each app has a unique context relative the current profile
-        # Find it, and keep track of it.
+        """Resolve `profile` and list requests of its applications
 
-        # Resolve profile
+        Each app has a unique context relative the current profile,
+        resolved separately by `_resolve_apps`.
 
-        with util.timing() as t:
-            variants = list(profile.iter_variants())
-            profile_variant = variants[0]
-
-            if len(variants) > 1:
-                # Unsure of whether this is desirable. It would enable
-                # a profile per platform, or potentially other kinds
-                # of special-purpose situations. If you see this,
-                # and want this, submit an issue with your use case!
-                self.warning(
-                    "Profiles with multiple variants are unsupported. "
-                    "Using first found: %s" % profile_variant
-                )
+        Returns:
+            tuple: Qualified profile name, its context and app requests
+
+        """
 
-            qualified_profile_name = profile_variant.qualified_package_name
+        with util.timing() as t:
+            qualified_profile_name = self._qualified_profile_name(profile)
             profile_request = [qualified_profile_name]
             self.debug("Resolving request: %s" % qualified_profile_name)
 
             # Before resolving apps, need to know whether this profile can
             # be resolved or not.
-            self.env(profile_request)
+            profile_context = self.env(profile_request)
 
         self.debug("Resolved profile context in %.2f seconds" % t.duration)
 
-        # Resolve app with profile
+        apps = self._app_requests(profile)
+
+        return qualified_profile_name, profile_context, apps
+
+    def _qualified_profile_name(self, profile):
+        variants = list(profile.iter_variants())
+        profile_variant = variants[0]
+
+        if len(variants) > 1:
+            # Unsure of whether this is desirable. It would enable
+            # a profile per platform, or potentially other kinds
+            # of special-purpose situations. If you see this,
+            # and want this, submit an issue with your use case!
+            self.warning(
+                "Profiles with multiple variants are unsupported. "
+                "Using first found: %s" % profile_variant
+            )
+
+        return profile_variant.qualified_package_name
+
+    def _app_requests(self, profile):
+        """Return requests of applications to list for `profile`"""
 
         apps = []
         _apps = allzparkconfig.applications
@@ -1118,96 +2496,215 @@ class Controller(QtCore.QObject):
         if not apps:
             apps[:] = allzparkconfig.applications_from_package(profile)
 
+        return apps
+
+    def _latest_app(self, request):
+        """Return latest package of application `request`, and all versions
+
+        Missing applications are returned as a BrokenPackage
+
+        """
+
+        request = request.strip("~")
+        req = rez.PackageRequest(request)
+
+        try:
+            app_vers = list(self.find(req.name, range_=req.range))
+            latest = app_vers[-1]
+        except IndexError:
+            self.error("No package matched for request '%s', may have"
+                       "been excluded by package filter.")
+            latest = model.BrokenPackage(request)
+            app_vers = [latest]
+        except (rez.PackageFamilyNotFoundError,
+                rez.PackageNotFoundError) as e:
+            self.error(str(e))
+            latest = model.BrokenPackage(request)
+            app_vers = [latest]
+
+        return latest, app_vers
+
+    def _list_lazy_apps(self, requests):
+        """List applications from their package alone, without resolving
+
+        Returns:
+            tuple: Visible applications, original request
+                and package per application
+
+        """
+
+        visible_apps = odict()
+        lazy_apps = odict()
+        rez_apps = odict()
+        show_hidden = self._state.retrieve("showHiddenApps")
+
+        for request in requests:
+            latest, app_vers = self._latest_app(request)
+            app_request = "%s==%s" % (latest.name, latest.version)
+
+            if not isinstance(latest, model.BrokenPackage):
+                # Like a resolved application, albeit of any variant
+                latest = next(latest.iter_variants())
+
+            lazy_apps[app_request] = request
+            rez_apps[app_request] = latest
+
+            data = allzparkconfig.metadata_from_package(latest)
+            if data.get("hidden", False) and not show_hidden:
+                continue
+
+            visible_apps[app_request] = {
+                "package": latest,
+                "versions": [str(v.version) for v in app_vers],
+            }
+
+        return visible_apps, lazy_apps, rez_apps
+
+    def _resolve_apps(self, qualified_profile_name, apps,
+                      profile_context=None, progress=None, cancelled=None,
+                      pool=None):
+        """Resolve each of `apps` alongside the profile
+
+        Arguments:
+            qualified_profile_name (str): E.g. "profile-1.0"
+            apps (list): Requests of applications
+            profile_context (ResolvedContext, optional): Resolve of the
+                profile on its own, whose versions are tried first
+            progress (callable, optional): Called with the family, request,
+                context, package and visible data (or None, if hidden)
+                of each application as soon as it is resolved
+            cancelled (callable, optional): Stop in between applications
+                once this returns True, raising util.Cancelled
+            pool (util.Pool, optional): Resolve using these threads,
+                rather than those of the resolve pool
+
+        Returns:
+            tuple: Visible applications, contexts, packages per
+                application and the startup application, if any
+
+        """
+
         # Optional patch
-        patch = self._state.retrieve("patch", "").split()
+        patch = _parse_patch(self._state.retrieve("patch", ""))
         patch_with_filter = self._state.retrieve("patchWithFilter", False)
 
+        # Applications typically share the versions resolved for the
+        # profile, limiting the solver to those saves it from having
+        # to reduce the profile requirements over again for each app.
+        pins = []
+        if (allzparkconfig.pin_profile_resolve and
+                profile_context is not None and profile_context.success):
+            pins = [
+                pkg for pkg in profile_context.resolved_packages
+                if pkg.name not in patch
+            ]
+
         app_ranges = dict()
 
         def _try_finding_latest_app(req_str):
-            req_str = req_str.strip("~")
-            req = rez.PackageRequest(req_str)
-            try:
-                app_vers = list(self.find(req.name, range_=req.range))
-                latest = app_vers[-1]
-            except IndexError:
-                self.error("No package matched for request '%s', may have"
-                           "been excluded by package filter.")
-                latest = model.BrokenPackage(req_str)
-                app_vers = [latest]
-            except _missing as e_:
-                self.error(str(e_))
-                latest = model.BrokenPackage(req_str)
-                app_vers = [latest]
-
-            app_ranges[req.name] = app_vers
+            latest, app_vers = self._latest_app(req_str)
+            app_ranges[latest.name] = app_vers
             return latest
 
+        pinned = set(pkg.name for pkg in pins)
+
+        def _env(request, use_filter=True):
+            if pins:
+                try:
+                    context = self.env(request, use_filter, pins=pins)
+                except _missing as e_:
+                    if not _blames(str(e_), pinned):
+                        raise
+                else:
+                    if context.success or not _blames(
+                            context.failure_description or "", pinned):
+                        return context
+
+                # The application requires versions other than those
+                # of the profile. Let the solver have another go with
+                # every version available. Failures unrelated to pins
+                # would only fail again, and aren't worth the solve.
+
+            return self.env(request, use_filter)
+
         def _try_resolve_context(req, pkg_name, mode):
             kwargs = dict()
             if mode == "Patch":
                 kwargs["use_filter"] = patch_with_filter
             try:
-                return self.env(req, **kwargs)
+                return _env(req, **kwargs)
             except _missing as e_:
                 self.error("%s failed: %s" % (mode, str(e_)))
                 return model.BrokenContext(pkg_name, req)
 
-        _missing = (rez.PackageFamilyNotFoundError, rez.PackageNotFoundError)
+        def _resolve_then_patch(request, app_package):
+            self.debug("Resolving request: %s" % " ".join(request))
+            context = _try_resolve_context(request,
+                                           app_package.name,
+                                           mode="Resolve")
 
-        contexts = odict()
-        with util.timing() as t:
+            if context.success:
+                context_patch = list(patch.values())
+            else:
+                context_patch = None
+
+            if context_patch:
+                self.debug("Patching request: %s" % " ".join(context_patch))
+                request = context.get_patched_request(context_patch)
+                context = _try_resolve_context(request,
+                                               app_package.name,
+                                               mode="Patch")
 
-            current_app = self._state["appRequest"] or ""
-            current_app = current_app.split("==", 1)[0]
+            return context
 
-            for app_request in apps:
+        def _resolve_app(app_request):
+            t0 = time.time()
+            app_package = _try_finding_latest_app(app_request)
 
-                app_package = _try_finding_latest_app(app_request)
+            app_request = "%s==%s" % (app_package.name,
+                                      app_package.version)
 
-                app_request = "%s==%s" % (app_package.name,
-                                          app_package.version)
+            request = [qualified_profile_name, app_request]
+            context = None
 
-                request = [qualified_profile_name, app_request]
-                self.debug("Resolving request: %s" % " ".join(request))
-                context = _try_resolve_context(request,
-                                               app_package.name,
-                                               mode="Resolve")
-
-                if context.success and patch:
-                    self.debug("Patching request: %s" % " ".join(patch))
-                    request = context.get_patched_request(patch)
-                    context = _try_resolve_context(request,
-                                                   app_package.name,
-                                                   mode="Patch")
-
-                # To avoid application selection change on patched or
-                # set back to default:
-                #   1. update context key `app_request`, and
-                #   2. update startup app
-                if context.success:
-                    for pkg in context.resolved_packages or []:
-                        if pkg.name == app_package.name:
-                            app_request = "%s==%s" % (pkg.name, pkg.version)
-                            if pkg.name == current_app:
-                                self._state.store("startupApplication",
-                                                  app_request)
-                            break
-
-                contexts[app_request] = context
-
-        # Associate a Rez package with an app
-        for app_request, rez_context in contexts.items():
+            if patch and allzparkconfig.patch_single_solve:
+                patched = _patch_request(request, patch)
+            else:
+                patched = None
+
+            if patched is not None:
+                self.debug("Resolving patched request: %s"
+                           % " ".join(patched))
+                try:
+                    context = _env(patched, use_filter=patch_with_filter)
+                except _missing:
+                    context = None
+
+                if context is not None and not context.success:
+                    # Let the original resolve tell whether it
+                    # was the application or the patch at fault
+                    context = None
+
+            if context is None:
+                context = _resolve_then_patch(request, app_package)
+
+            self.debug("Resolved %s in %.2f seconds"
+                       % (app_request, time.time() - t0))
+
+            return app_package, app_request, context
+
+        _missing = (rez.PackageFamilyNotFoundError, rez.PackageNotFoundError)
+
+        def _associate(app_request, rez_context):
+            """Return the Rez package of an application"""
             try:
-                rez_pkg = next(
+                return next(
                     pkg
                     for pkg in rez_context.resolved_packages
                     if "%s==%s" % (pkg.name, pkg.version) == app_request
                 )
 
             except StopIteration:
-                rez_pkg = model.BrokenPackage(app_request)
-
                 self.warning(
                     "Couldn't find a corresponding package for "
                     "application %s. This can happen if an application is "
@@ -1217,8 +2714,6 @@ class Controller(QtCore.QObject):
 
             except TypeError:
                 # resolved_packages was None, a sign that a context was broken
-                rez_pkg = model.BrokenPackage(app_request)
-
                 if rez_context.success:
                     self.warning(
                         "This shouldn't have happened, "
@@ -1239,31 +2734,84 @@ class Controller(QtCore.QObject):
                         (app_request, rez_context.failure_description)
                     )
 
-            self._state["rezApps"][app_request] = rez_pkg
+            return model.BrokenPackage(app_request)
 
-        self._state["rezContexts"] = contexts
+        def _resolve_and_associate(request):
+            if cancelled is not None and cancelled():
+                # Release this thread for whatever superseded us
+                raise util.Cancelled()
 
-        self.debug("Resolved all contexts in %.2f seconds" % t.duration)
+            app_package, app_request, context = _resolve_app(request)
+
+            # To avoid application selection change on patched or
+            # set back to default, update context key `app_request`
+            if context.success:
+                for pkg in context.resolved_packages or []:
+                    if pkg.name == app_package.name:
+                        app_request = "%s==%s" % (pkg.name, pkg.version)
+                        break
+
+            rez_pkg = _associate(app_request, context)
 
-        visible_apps = dict()
+            # Opt-out hidden application
+            data = allzparkconfig.metadata_from_package(rez_pkg)
 
-        # * Opt-out hidden application
-        # * Find application versions
+            if data.get("hidden", False) and not show_hidden:
+                data = None
+            else:
+                data = {
+                    "package": rez_pkg,
+                    "versions": [
+                        str(v.version) for v in app_ranges[rez_pkg.name]
+                    ],
+                }
+
+            result = (app_package.name, app_request, context, rez_pkg, data)
+
+            if progress is not None:
+                progress(result)
+
+            return result
+
+        contexts = odict()
+        rez_apps = odict()
+        visible_apps = odict()
+        startup_app = None
         show_hidden = self._state.retrieve("showHiddenApps")
-        for request, app_pkg in self._state["rezApps"].items():
-            data = allzparkconfig.metadata_from_package(app_pkg)
-            hidden = data.get("hidden", False)
 
-            if hidden and not show_hidden:
-                continue
+        current_app = self._state["appRequest"] or ""
+        current_app = current_app.split("==", 1)[0]
 
-            app_versions = [str(v.version) for v in app_ranges[app_pkg.name]]
-            visible_apps[request] = {
-                "package": app_pkg,
-                "versions": app_versions,
-            }
+        startup_family = self._state.retrieve("startupApplication") or ""
+        startup_family = startup_family.split("==", 1)[0]
+        last_used = self._state.last_used()
+
+        def _priority(request):
+            """Startup application first, followed by most recently used"""
+            family = rez.PackageRequest(request.strip("~")).name
+            return family != startup_family, -last_used.get(family, 0)
+
+        with util.timing() as t:
+
+            # Resolve in parallel, but keep the order of `apps`
+            pool = pool or self._pools["resolve"]
+            results = pool.map(_resolve_and_associate, apps, key=_priority)
+
+        self.debug("Resolved all contexts in %.2f seconds" % t.duration)
+
+        for family, app_request, context, rez_pkg, data in results:
+            contexts[app_request] = context
+            rez_apps[app_request] = rez_pkg
+
+            if data is not None:
+                visible_apps[app_request] = data
 
-        return visible_apps
+            if context.success and family == current_app:
+                startup_app = app_request
+
+        # State is updated on the main thread, once we know
+        # the profile is still the one being asked for
+        return visible_apps, contexts, rez_apps, startup_app
 
     def graph(self):
         context = self._state["rezContexts"][self._state["appRequest"]]
@@ -1308,24 +2856,37 @@ class Controller(QtCore.QObject):
         ) % sys.executable
 
         def load(message):
-            try:
-                env = json.loads(message)
-            except json.JSONDecodeError:
-                self.info(message)  # regular messages during resolve
-            else:
-                self._state["testedEnvirons"][app_request] = env
-                self._models["diagnose"].load(env)
+            # Output arrives in chunks, of which one line is the environment
+            for line in message.splitlines():
+                try:
+                    env = json.loads(line)
+                except ValueError:
+                    self.info(line)  # regular messages during resolve
+                else:
+                    self._state["testedEnvirons"][app_request] = env
+                    self._models["diagnose"].load(env)
 
         self.launch(command=command, stdout=load)
 
 
 class Command(QtCore.QObject):
+    # Output is delivered in chunks of one or more lines
     stdout = QtCore.Signal(str)
     stderr = QtCore.Signal(str)
+    started = QtCore.Signal()
     killed = QtCore.Signal()
 
     error = QtCore.Signal(Exception)
 
+    # Flush output from listening threads onto the main thread
+    flush_requested = QtCore.Signal()
+
+    # Milliseconds between flushes, and lines buffered before
+    # flushing immediately, such that chatty processes don't
+    # flood the GUI with one signal per line.
+    FlushInterval = 50
+    FlushSize = 500
+
     def __str__(self):
         return "Command('%s')" % self.cmd
 
@@ -1354,6 +2915,18 @@ class Command(QtCore.QObject):
         self.cmd = command
 
         self._running = False
+        self._buffers = {"stdout": [], "stderr": []}
+        self._lock = threading.Lock()
+
+        timer = QtCore.QTimer(self)
+        timer.setInterval(self.FlushInterval)
+        timer.timeout.connect(self.flush)
+
+        self.flush_requested.connect(self.flush, QtCore.Qt.QueuedConnection)
+        self.killed.connect(timer.stop)
+        self.error.connect(timer.stop)
+
+        self._timer = timer
 
         # Launching may take a moment, and there's no need
         # for the user to wait around for that to happen.
@@ -1368,8 +2941,30 @@ class Command(QtCore.QObject):
             return self.popen.pid
 
     def execute(self):
+        self._timer.start()
         self.thread.start()
 
+    def flush(self):
+        """Emit buffered output, called on the main thread"""
+        with self._lock:
+            stdout, self._buffers["stdout"] = self._buffers["stdout"], []
+            stderr, self._buffers["stderr"] = self._buffers["stderr"], []
+
+        if stdout:
+            self.stdout.emit("\n".join(stdout))
+
+        if stderr:
+            self.stderr.emit("\n".join(stderr))
+
+    def _buffer(self, stream, line):
+        with self._lock:
+            buffer = self._buffers[stream]
+            buffer.append(line)
+            full = len(buffer) >= self.FlushSize
+
+        if full:
+            self.flush_requested.emit()
+
     def _execute(self):
         startupinfo = None
         no_console = hasattr(allzparkconfig, "__noconsole__")
@@ -1420,11 +3015,16 @@ class Command(QtCore.QObject):
 
     def listen_on_stdout(self):
         self._running = True
+        self.started.emit()
         for line in iter(self.popen.stdout.readline, ""):
-            self.stdout.emit(line.rstrip())
+            self._buffer("stdout", line.rstrip())
         self._running = False
+
+        # Deliver remaining output ahead of `killed`
+        self.flush_requested.emit()
         self.killed.emit()
 
     def listen_on_stderr(self):
         for line in iter(self.popen.stderr.readline, ""):
-            self.stderr.emit(line.rstrip())
+            self._buffer("stderr", line.rstrip())
+        self.flush_requested.emit()
@@ -230,45 +230,93 @@ class Console(AbstractDockWidget):
 
     icon = "Prefs_Screen_32"
 
+    Levels = collections.OrderedDict([
+        ("Debug", logging.DEBUG),
+        ("Info", logging.INFO),
+        ("Warning", logging.WARNING),
+        ("Error", logging.ERROR),
+    ])
+
     def __init__(self, parent=None):
         super(Console, self).__init__("Console", parent)
         self.setAttribute(QtCore.Qt.WA_StyledBackground)
         self.setObjectName("Console")
 
         panels = {
-            "central": QtWidgets.QWidget()
+            "central": QtWidgets.QWidget(),
+            "head": QtWidgets.QWidget(),
         }
 
         widgets = {
-            "text": QtWidgets.QTextEdit()
+            "level": QtWidgets.QComboBox(),
+            "search": QtWidgets.QLineEdit(),
+            "text": QtWidgets.QListView(),
+        }
+
+        models = {
+            "source": model.LogModel(allzparkconfig.console_line_limit),
+            "proxy": model.LogProxyModel(),
         }
 
         self.setWidget(panels["central"])
 
-        widgets["text"].setReadOnly(True)
+        models["proxy"].setSourceModel(models["source"])
+
+        # Only lines in view are ever rendered
+        widgets["text"].setModel(models["proxy"])
+        widgets["text"].setUniformItemSizes(True)
+        widgets["text"].setSelectionMode(widgets["text"].ExtendedSelection)
         widgets["text"].setObjectName("consolelog")
 
+        widgets["level"].addItems(list(self.Levels))
+        widgets["search"].setPlaceholderText("Filter log..")
+
+        copy = QtWidgets.QAction("Copy", widgets["text"])
+        copy.setShortcut(QtGui.QKeySequence.Copy)
+        copy.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        copy.triggered.connect(self.on_copy)
+        widgets["text"].addAction(copy)
+
+        layout = QtWidgets.QHBoxLayout(panels["head"])
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(widgets["level"])
+        layout.addWidget(widgets["search"], stretch=True)
+
         layout = QtWidgets.QVBoxLayout(panels["central"])
         layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(panels["head"])
         layout.addWidget(widgets["text"])
 
+        widgets["level"].currentIndexChanged.connect(self.on_level_changed)
+        widgets["search"].textChanged.connect(
+            models["proxy"].setFilterFixedString)
+
         self._widgets = widgets
+        self._models = models
 
-    def append(self, line, level=logging.INFO):
-        color = "<font color=\"%s\">" % res.log_level_color(level)
+    def append(self, line, level=logging.INFO, html=False):
+        if html:
+            # E.g. error messages, formatted for display elsewhere
+            line = util.html_to_text(line)
 
-        line = line.replace(" ", "&nbsp;")
-        line = line.replace("\n", "<br>")
-        line = "%s%s</font><br>" % (color, line)
+        scrollbar = self._widgets["text"].verticalScrollBar()
+        at_bottom = scrollbar.value() == scrollbar.maximum()
 
-        cursor = self._widgets["text"].textCursor()
-        cursor.movePosition(QtGui.QTextCursor.End)
+        self._models["source"].append(line, level)
 
-        self._widgets["text"].setTextCursor(cursor)
-        self._widgets["text"].insertHtml(line)
+        if at_bottom:
+            self._widgets["text"].scrollToBottom()
 
-        scrollbar = self._widgets["text"].verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+    def on_level_changed(self, index):
+        level = list(self.Levels.values())[index]
+        self._models["proxy"].set_level(level)
+
+    def on_copy(self):
+        view = self._widgets["text"]
+        rows = sorted(view.selectionModel().selectedRows(),
+                      key=lambda index: index.row())
+        text = "\n".join(index.data() for index in rows)
+        QtWidgets.QApplication.clipboard().setText(text)
 
 
 class Packages(AbstractDockWidget):
@@ -335,6 +383,7 @@ class Packages(AbstractDockWidget):
 
         widgets["args"].changed.connect(self.on_argument_changed)
         ctrl.resetted.connect(self.on_resetted)
+        ctrl.patch_changed.connect(self.on_patch_changed)
 
         self._ctrl = ctrl
         self._panels = panels
@@ -351,14 +400,14 @@ class Packages(AbstractDockWidget):
             self._ctrl.reset()
 
         if arg["name"] == "patch":
-            # (TODO) This will be called twice since qargparse.String
-            #   may emit changed signal twice. And profile model item
-            #   will get doubled.
-            self._ctrl.state.store("patch", arg.read())
-            self._ctrl.reset()
+            # qargparse.String may emit changed signal twice,
+            # the second of which is a no-op
+            self._ctrl.set_patch(arg.read())
 
     def on_resetted(self):
-        patch = self._ctrl.state.retrieve("patch", "")
+        self.on_patch_changed(self._ctrl.state.retrieve("patch", ""))
+
+    def on_patch_changed(self, patch):
         arg = self._widgets["args"].find("patch")
         arg._write(patch)
         arg._previous = patch
@@ -706,15 +755,25 @@ class Environment(AbstractDockWidget):
         }
 
         widgets = {
+            "stack": QtWidgets.QStackedWidget(),
+            "loading": QtWidgets.QLabel("Computing environment.."),
+            "failed": QtWidgets.QLabel(),
             "view": JsonView(),
             "penv": JsonView(),
             "test": JsonView(),
             "compute": QtWidgets.QPushButton("Compute Environment"),
         }
 
+        widgets["loading"].setAlignment(QtCore.Qt.AlignCenter)
+        widgets["failed"].setAlignment(QtCore.Qt.AlignCenter)
+        widgets["failed"].setWordWrap(True)
+        widgets["stack"].addWidget(widgets["loading"])
+        widgets["stack"].addWidget(widgets["failed"])
+        widgets["stack"].addWidget(widgets["view"])
+
         layout = QtWidgets.QVBoxLayout(pages["environment"])
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(widgets["view"])
+        layout.addWidget(widgets["stack"])
 
         layout = QtWidgets.QVBoxLayout(pages["penv"])
         layout.setContentsMargins(0, 0, 0, 0)
@@ -741,6 +800,12 @@ class Environment(AbstractDockWidget):
         pages["editor"].warning.connect(self.on_env_warning)
         widgets["compute"].clicked.connect(ctrl.test_environment)
 
+        # Environments are expensive, and only computed when looked at
+        ctrl.application_changed.connect(self.on_application_changed)
+        ctrl.environ_changed.connect(self.on_environ_changed)
+        ctrl.environ_failed.connect(self.on_environ_failed)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+
         self.setWidget(panels["central"])
 
         self._ctrl = ctrl
@@ -775,6 +840,27 @@ class Environment(AbstractDockWidget):
     def on_state_appok(self):
         self._widgets["compute"].setEnabled(True)
 
+    def on_application_changed(self):
+        self._widgets["stack"].setCurrentWidget(self._widgets["loading"])
+
+        if self.isVisible():
+            self._ctrl.request_environ()
+
+    def on_visibility_changed(self, visible):
+        loading = self._widgets["stack"].currentWidget() is \
+            self._widgets["loading"]
+
+        if visible and loading and self._ctrl.current_application:
+            self._ctrl.request_environ()
+
+    def on_environ_changed(self, app_request):
+        self._widgets["stack"].setCurrentWidget(self._widgets["view"])
+
+    def on_environ_failed(self, app_request, message):
+        self._widgets["failed"].setText(
+            "Could not compute environment, see Console\n\n%s" % message)
+        self._widgets["stack"].setCurrentWidget(self._widgets["failed"])
+
     def on_env_applied(self, env):
         self._ctrl.state.store("userEnv", env)
         self._ctrl.info("User environment successfully saved")
@@ -1117,7 +1203,7 @@ class Preferences(AbstractDockWidget):
                 "Clear package repository cache at this interval, in \n"
                 "seconds.\n\n"
     
-                "Default 10. (Requires restart)\n\n"
+                "Default 10.\n\n"
     
                 "Normally, filesystem calls like `os.listdir` are \n"
                 "cached so as to avoid unnecessary calls. However, \n"
@@ -1128,7 +1214,10 @@ class Preferences(AbstractDockWidget):
                 "Clearing ths cache should have a very small impact \n"
                 "on performance and is safe to do frequently. It has \n"
                 "no effect on memcached which has a much greater \n"
-                "impact on performance."
+                "impact on performance.\n\n"
+
+                "Allzpark refreshes whenever a package used by \n"
+                "the current profile has changed."
             )),
 
             qargparse.String(
@@ -1506,6 +1595,7 @@ class CssHighlighter(QtGui.QSyntaxHighlighter):
 class ProfileView(QtWidgets.QTreeView):
 
     activated = QtCore.Signal(str)
+    hovered = QtCore.Signal(str)  # For a moment, see `speculative_hover`
 
     def __init__(self, parent=None):
         super(ProfileView, self).__init__(parent)
@@ -1514,9 +1604,39 @@ class ProfileView(QtWidgets.QTreeView):
         self.setSortingEnabled(True)
         self.sortByColumn(0, QtCore.Qt.AscendingOrder)
         self.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
+        self.setMouseTracking(True)
+
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.timeout.connect(self.on_hover_timeout)
+
+        self._hover = {"timer": timer, "profile": None}
 
         self.customContextMenuRequested.connect(self.on_context_menu)
 
+    def mouseMoveEvent(self, event):
+        index = self.indexAt(event.pos())
+        profile = index.data(model.NameRole) if index.isValid() else None
+
+        if profile != self._hover["profile"]:
+            self._hover["profile"] = profile
+            self._hover["timer"].stop()
+
+            if profile and allzparkconfig.speculative_hover:
+                self._hover["timer"].start(
+                    int(allzparkconfig.speculative_hover * 1000))
+
+        return super(ProfileView, self).mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._hover["profile"] = None
+        self._hover["timer"].stop()
+        return super(ProfileView, self).leaveEvent(event)
+
+    def on_hover_timeout(self):
+        if self._hover["profile"]:
+            self.hovered.emit(self._hover["profile"])
+
     def on_context_menu(self, position):
         index = self.indexAt(position)
 
@@ -1578,6 +1698,7 @@ class Profiles(AbstractDockWidget):
             "refresh": QtWidgets.QPushButton(""),
             "search": QtWidgets.QLineEdit(),
             "view": ProfileView(),
+            "scanned": QtWidgets.QLabel(),
 
             "tools": QtWidgets.QWidget(),
             "favorite": QtWidgets.QPushButton(""),
@@ -1618,6 +1739,7 @@ class Profiles(AbstractDockWidget):
         layout.addWidget(widgets["tools"], 1, 0)
         layout.addWidget(widgets["search"], 0, 1)
         layout.addWidget(widgets["view"], 1, 1)
+        layout.addWidget(widgets["scanned"], 2, 1)
 
         layout = QtWidgets.QVBoxLayout(panels["central"])
         layout.setContentsMargins(4, 4, 4, 4)
@@ -1683,6 +1805,8 @@ class Profiles(AbstractDockWidget):
 
         # signals
         view.activated.connect(self.profile_changed.emit)
+        view.hovered.connect(ctrl.anticipate_profile)
+        view.clicked.connect(self.on_profile_clicked)
         selection.currentChanged.connect(self.on_selected_profile_changed)
         version.changed.connect(self.version_changed.emit)
         search.textChanged.connect(view.expandAll)
@@ -1695,6 +1819,9 @@ class Profiles(AbstractDockWidget):
         widgets["expand"].clicked.connect(view.expandAll)
         widgets["collapse"].clicked.connect(view.collapseAll)
         ctrl.resetted.connect(view.expandAll)
+        ctrl.profiles_scanned.connect(self.on_profiles_scanned)
+
+        widgets["scanned"].hide()
 
         self._widgets = widgets
         self._models = models
@@ -1753,10 +1880,22 @@ class Profiles(AbstractDockWidget):
 
         proxy.invalidateFilter()
 
+    def on_profiles_scanned(self, scanned, total):
+        label = self._widgets["scanned"]
+        label.setText("Scanning profiles.. %d/%d" % (scanned, total))
+        label.setVisible(scanned < total)
+
     def on_selected_profile_changed(self):
         view = self._widgets["view"]
         self.update_favorite_btn(view.selected_profile())
 
+    def on_profile_clicked(self, index):
+        profile = index.data(model.NameRole)
+
+        if profile:
+            # Likely to be activated next
+            self._ctrl.anticipate_profile(profile)
+
     def update_favorite_btn(self, profile):
         btn = self._widgets["favorite"]
         btn.setEnabled(bool(profile))
@@ -37,6 +37,7 @@ import re
 import os
 import logging
 import itertools
+import collections
 
 from . import allzparkconfig, util, resources as res
 from . import _rezapi as rez
@@ -63,6 +64,7 @@ LocalizingRole = QtCore.Qt.UserRole + 1
 BetaRole = QtCore.Qt.UserRole + 2
 LatestRole = QtCore.Qt.UserRole + 3
 NameRole = QtCore.Qt.UserRole + 4
+LevelRole = QtCore.Qt.UserRole + 5
 
 
 class AbstractTableModel(QtCore.QAbstractTableModel):
@@ -147,8 +149,12 @@ class AbstractTableModel(QtCore.QAbstractTableModel):
 
 
 def parse_icon(root, template):
+    return QtGui.QIcon(icon_path(root, template))
+
+
+def icon_path(root, template):
     try:
-        fname = template.format(
+        return template.format(
             root=root,
             width=32,
             height=32,
@@ -157,18 +163,19 @@ def parse_icon(root, template):
         )
 
     except KeyError:
-        fname = ""
-
-    return QtGui.QIcon(fname)
+        return ""
 
 
 class AbstractPackageItem(dict):
 
     def __init__(self, name, package, versions, metadata):
+        fname = icon_path(package.root, template=metadata["icon"])
+
         super(AbstractPackageItem, self).__init__({
             "name": name,
             "label": metadata["label"],
-            "icon": parse_icon(package.root, template=metadata["icon"]),
+            "icon": QtGui.QIcon(fname),
+            "iconPath": fname,
             "family": package.name,
             "package": package,
             "version": str(package.version),
@@ -198,6 +205,62 @@ class ApplicationItem(AbstractPackageItem):
             "tool": None,  # Current tool
             "tools": tools,  # All available tools
             "detached": False,  # Open in separate console or not
+            "resolving": False,
+            "stale": False,
+        })
+
+
+class PendingApplicationItem(dict):
+    """Placeholder for an application whose context is being resolved"""
+
+    def __init__(self, family):
+        super(PendingApplicationItem, self).__init__({
+            "name": family,
+            "label": family,
+            "icon": QtGui.QIcon(),
+            "iconPath": "",
+            "family": family,
+            "package": None,
+            "version": "resolving..",
+            "versions": [],
+            "default": "",
+            "context": None,
+            "active": True,
+            "_hasVersions": False,
+            "hidden": False,
+            "broken": False,
+            "tool": None,
+            "tools": [],
+            "detached": False,
+            "resolving": True,
+            "stale": False,
+        })
+
+
+class StaleApplicationItem(dict):
+    """An application as it was last session, until resolved anew"""
+
+    def __init__(self, data):
+        super(StaleApplicationItem, self).__init__({
+            "name": data["name"],
+            "label": data["label"],
+            "icon": QtGui.QIcon(data["iconPath"]),
+            "iconPath": data["iconPath"],
+            "family": data["family"],
+            "package": None,
+            "version": data["version"],
+            "versions": data["versions"],
+            "default": data["version"],
+            "context": None,
+            "active": True,
+            "_hasVersions": len(data["versions"]) > 1,
+            "hidden": data["hidden"],
+            "broken": data["broken"],
+            "tool": None,
+            "tools": data["tools"],
+            "detached": False,
+            "resolving": False,
+            "stale": True,
         })
 
 
@@ -247,7 +310,16 @@ class ApplicationModel(AbstractTableModel):
         super(ApplicationModel, self).__init__(*args, **kwargs)
         self._broken_icon = res.icon("Action_Stop_1_32.png")
 
-    def reset(self, applications=None):
+    def reset(self, applications=None, pending=None):
+        """Replace all applications
+
+        Arguments:
+            applications (dict, optional): Data per application request
+            pending (list, optional): Families of applications still
+                being resolved, replaced via `update`
+
+        """
+
         applications = applications or dict()
 
         self.beginResetModel()
@@ -257,8 +329,124 @@ class ApplicationModel(AbstractTableModel):
             item = ApplicationItem(app_request, data)
             self.items.append(item)
 
+        for family in pending or []:
+            item = PendingApplicationItem(family)
+            self.items.append(item)
+
+        self.endResetModel()
+
+    def restore(self, snapshot):
+        """Replace all applications with those of `snapshot`
+
+        These are shown as stale, until replaced via `reconcile`
+        and `update` once resolved anew.
+
+        Arguments:
+            snapshot (list): As returned by `snapshot`
+
+        """
+
+        self.beginResetModel()
+        self.items[:] = [StaleApplicationItem(data) for data in snapshot]
         self.endResetModel()
 
+    def snapshot(self):
+        """Return applications in a form suitable for storing on disk"""
+        return [
+            {
+                "name": item["name"],
+                "label": item["label"],
+                "iconPath": item["iconPath"],
+                "family": item["family"],
+                "version": item["version"],
+                "versions": item["versions"],
+                "hidden": item["hidden"],
+                "broken": item["broken"],
+                "tools": item["tools"],
+            }
+            for item in self.items
+            if not item["resolving"]
+        ]
+
+    def reconcile(self, families):
+        """Make way for applications of `families` whilst keeping stale ones
+
+        Like `reset` with `pending`, except stale rows of any of `families`
+        stay where they are until replaced via `update`, and only rows
+        that differ are removed, inserted or moved.
+
+        Arguments:
+            families (list): Families of applications being resolved
+
+        """
+
+        parent = QtCore.QModelIndex()
+
+        for row in reversed(range(len(self.items))):
+            if self.items[row]["family"] not in families:
+                self.beginRemoveRows(parent, row, row)
+                self.items.pop(row)
+                self.endRemoveRows()
+
+        for row, family in enumerate(families):
+            if row < len(self.items) and self.items[row]["family"] == family:
+                continue
+
+            existing = next((
+                index for index, item in enumerate(self.items)
+                if item["family"] == family
+            ), None)
+
+            if existing is None:
+                self.beginInsertRows(parent, row, row)
+                self.items.insert(row, PendingApplicationItem(family))
+                self.endInsertRows()
+
+            else:
+                self.beginMoveRows(parent, existing, existing, parent, row)
+                self.items.insert(row, self.items.pop(existing))
+                self.endMoveRows()
+
+    def update(self, previous, app_request, data=None):
+        """Replace application `previous` in place
+
+        Arguments:
+            previous (str): Request of application to replace, or
+                family of a stale application
+            app_request (str): Request of replacing application
+            data (dict, optional): Replacement, None to remove `previous`
+
+        """
+
+        row = next((
+            index for index, item in enumerate(self.items)
+            if item["name"] == previous or (
+                item["stale"] and item["family"] == previous)
+        ), None)
+
+        if data is None:
+            if row is not None:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                self.items.pop(row)
+                self.endRemoveRows()
+            return
+
+        item = ApplicationItem(app_request, data)
+
+        if row is None:
+            row = len(self.items)
+            self.beginInsertRows(QtCore.QModelIndex(), row, row)
+            self.items.append(item)
+            self.endInsertRows()
+            return
+
+        self.items[row] = item
+        QtCompat.dataChanged(
+            self,
+            self.index(row, 0),
+            self.index(row, self.columnCount(QtCore.QModelIndex()) - 1),
+        )
+
     def data(self, index, role):
         row = index.row()
         col = index.column()
@@ -268,10 +456,16 @@ class ApplicationModel(AbstractTableModel):
         except IndexError:
             return None
 
-        if data["hidden"]:
+        if data["hidden"] or data["resolving"] or data["stale"]:
             if role == QtCore.Qt.ForegroundRole:
                 return QtGui.QColor("gray")
 
+        if data["stale"]:
+            if role == QtCore.Qt.FontRole:
+                font = QtGui.QFont()
+                font.setItalic(True)
+                return font
+
         if data["broken"]:
             if role == QtCore.Qt.ForegroundRole:
                 return QtGui.QColor("red")
@@ -298,6 +492,15 @@ class ApplicationModel(AbstractTableModel):
         return super(ApplicationModel, self).data(index, role)
 
     def flags(self, index):
+        try:
+            item = self.items[index.row()]
+
+            if item["resolving"] or item["stale"]:
+                # Not selectable until resolved
+                return QtCore.Qt.ItemIsEnabled
+        except IndexError:
+            pass
+
         if index.column() == 1:
             return (
                 QtCore.Qt.ItemIsEnabled |
@@ -422,6 +625,42 @@ class PackagesModel(AbstractTableModel):
 
         self.endResetModel()
 
+    def update(self, packages):
+        """Update rows whose package has changed, keeping the rest
+
+        Arguments:
+            packages (dict): Same as `reset`
+
+        """
+
+        for row in reversed(range(len(self.items))):
+            if self.items[row]["name"] not in packages:
+                self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+                self.items.pop(row)
+                self.endRemoveRows()
+
+        rows = {item["name"]: row for row, item in enumerate(self.items)}
+        last = self.columnCount(QtCore.QModelIndex()) - 1
+
+        for name, data in packages.items():
+            data["override"] = self._overrides.get(name)
+            data["disabled"] = self._disabled.get(name, False)
+
+            row = rows.get(name)
+
+            if row is None:
+                row = len(self.items)
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self.items.append(PackageItem(name, data))
+                self.endInsertRows()
+
+            elif (self.items[row]["package"] != data["package"] or
+                    self.items[row]["versions"] != data["versions"]):
+                self.items[row] = PackageItem(name, data)
+                QtCompat.dataChanged(self,
+                                     self.index(row, 0),
+                                     self.index(row, last))
+
     def data(self, index, role):
         row = index.row()
         col = index.column()
@@ -532,6 +771,9 @@ class CommandsModel(AbstractTableModel):
         "status"
     ]
 
+    # Number of commands currently running
+    running_changed = QtCore.Signal(int)
+
     def append(self, command):
         index = len(self.items)
         app = command.app
@@ -549,21 +791,107 @@ class CommandsModel(AbstractTableModel):
         })
         self.endInsertRows()
 
-    def poll(self):
-        self.layoutAboutToBeChanged.emit()
+        # Status is updated as the process starts and exits,
+        # rather than by polling every command ever launched
+        command.started.connect(
+            lambda: self.update_status(command, "running"))
+        command.killed.connect(
+            lambda: self.update_status(command, "killed"))
+        command.error.connect(
+            lambda error: self.update_status(command, "killed"))
+
+    def update_status(self, command, value):
+        row = next(
+            row for row, item in enumerate(self.items)
+            if item["object"] is command
+        )
 
-        running_count = 0
-        for row in range(self.rowCount()):
-            command = self.items[row]["object"]
-            is_running = command.is_running()
-            running_count += is_running
-            value = "running" if is_running else "killed"
-            index = self.createIndex(row, 0, QtCore.QModelIndex())
+        if self.items[row]["running"] != value:
+            index = self.createIndex(row, 1, QtCore.QModelIndex())
             self.setData(index, value, "running")
 
-        self.layoutChanged.emit()
+        self.running_changed.emit(self.running_count())
+
+    def running_count(self):
+        return sum(item["running"] == "running" for item in self.items)
+
+
+class LogModel(QtCore.QAbstractListModel):
+    """Most recent `maxlen` lines of log, oldest first
+
+    Lines beyond `maxlen` are dropped from the top, such that
+    memory remains constant over the course of a long session.
+
+    """
+
+    def __init__(self, maxlen=10000, parent=None):
+        super(LogModel, self).__init__(parent)
+        self.items = collections.deque(maxlen=maxlen)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+
+        return len(self.items)
+
+    def data(self, index, role):
+        try:
+            message, level = self.items[index.row()]
+        except IndexError:
+            return None
+
+        if role == QtCore.Qt.DisplayRole:
+            return message
+
+        if role == QtCore.Qt.ForegroundRole:
+            return QtGui.QColor(res.log_level_color(level))
+
+        if role == LevelRole:
+            return level
+
+    def append(self, message, level=logging.INFO):
+        lines = message.split("\n")[-self.items.maxlen:]
+        overflow = len(self.items) + len(lines) - self.items.maxlen
+
+        if overflow > 0:
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.items.popleft()
+            self.endRemoveRows()
+
+        first = len(self.items)
+        self.beginInsertRows(QtCore.QModelIndex(),
+                             first, first + len(lines) - 1)
+        self.items.extend((line, level) for line in lines)
+        self.endInsertRows()
+
+    def reset(self):
+        self.beginResetModel()
+        self.items.clear()
+        self.endResetModel()
+
 
-        return running_count
+class LogProxyModel(QtCore.QSortFilterProxyModel):
+    """Filter log by minimum level and search string"""
+
+    def __init__(self, parent=None):
+        super(LogProxyModel, self).__init__(parent)
+        self.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self._level = logging.NOTSET
+
+    def set_level(self, level):
+        self._level = level
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        index = model.index(source_row, 0, source_parent)
+
+        if model.data(index, LevelRole) < self._level:
+            return False
+
+        return super(LogProxyModel, self).filterAcceptsRow(
+            source_row, source_parent)
 
 
 class JsonModel(qjsonmodel.QJsonModel):
@@ -923,6 +1251,7 @@ class ProfileModel(AbstractTreeModel):
         self.is_filtering = True
         self.current = ""
         self.favorites = set([])
+        self.entries = []
 
         self.icons = [
             # normal
@@ -967,24 +1296,43 @@ class ProfileModel(AbstractTreeModel):
 
     def reset(self, profiles=None):
         profiles = profiles or dict()
-
-        self.beginResetModel()
-        self.root = TreeItem()
-
-        categories = dict()
+        entries = list()
 
         for name, versions in profiles.items():
             # NOTE: This model only takes the latest profile
             package = versions[Latest]
             data = allzparkconfig.metadata_from_package(package)
 
-            item = TreeItem({
+            entries.append({
                 "name": name,
                 "label": data.get("label", name),
-                "icon": self.profile_icon(name),
                 "category": data.get("category", self.DefaultCategory),
             })
 
+        self.restore(entries)
+
+    def restore(self, entries):
+        """Replace all profiles with `entries`, as returned by `snapshot`"""
+
+        if entries == self.entries:
+            # E.g. the same as what was restored from the last session
+            return
+
+        self.beginResetModel()
+        self.root = TreeItem()
+        self.entries = entries
+
+        categories = dict()
+
+        for entry in entries:
+            name = entry["name"]
+            item = TreeItem({
+                "name": name,
+                "label": entry["label"],
+                "icon": self.profile_icon(name),
+                "category": entry["category"],
+            })
+
             category_name = item["category"]
             if category_name in categories:
                 category = categories[category_name]
@@ -1001,6 +1349,10 @@ class ProfileModel(AbstractTreeModel):
 
         self.endResetModel()
 
+    def snapshot(self):
+        """Return profiles in a form suitable for storing on disk"""
+        return list(self.entries)
+
     def profile_icon(self, name):
         is_favorite = (name in self.favorites) * 1
         is_current = (name == self.current) * 2
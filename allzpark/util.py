@@ -1,8 +1,10 @@
 import os
 import re
 import time
+import threading
 import traceback
 import functools
+import itertools
 import contextlib
 import logging
 import collections
@@ -10,10 +12,9 @@ import webbrowser
 import subprocess
 
 from .vendor import six
-from .vendor.Qt import QtCore
+from .vendor.Qt import QtCore, QtGui
 
-_lru_cache = {}
-_threads = []
+_caches = []
 _basestring = six.string_types[0]  # For Python 2/3
 _log = logging.getLogger(__name__)
 _timer = (time.process_time
@@ -53,30 +54,214 @@ def async_(func):
     return func
 
 
-def cached(func):
-    """Cache returnvalue of `func`"""
+def cached(func=None, maxsize=128, ttl=None):
+    """Cache returnvalue of `func`
+
+    Least recently used values are evicted once `maxsize` is reached,
+    and values older than `ttl` seconds are recomputed. Calls with
+    unhashable arguments are passed through uncached, and values
+    computed whilst being cleared are returned but not kept.
+
+    Arguments:
+        func (callable): Function to cache
+        maxsize (int, optional): Maximum number of values kept,
+            None for unbounded
+        ttl (float, optional): Seconds until a value expires,
+            None for never
+
+    """
+
+    if func is None:
+        return functools.partial(cached, maxsize=maxsize, ttl=ttl)
+
+    cache = collections.OrderedDict()
+    stats = {"hits": 0, "misses": 0}
+    cleared = [0]  # Times cleared, see `cache_clear`
+    lock = threading.Lock()
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        key = "{func}:{args}:{kwargs}".format(
-            func=func.__name__,
-            args=", ".join(str(arg) for arg in args),
-            kwargs=", ".join(
-                "%s=%s" % (key, value)
-                for key, value in kwargs.items()
-            )
-        )
+        key = (args, tuple(sorted(kwargs.items())))
 
         try:
-            value = _lru_cache[key]
-        except KeyError:
-            value = func(*args, **kwargs)
-            _lru_cache[key] = value
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        with lock:
+            try:
+                value, timestamp = cache.pop(key)
+            except KeyError:
+                pass
+            else:
+                if ttl is None or time.time() - timestamp < ttl:
+                    cache[key] = (value, timestamp)  # Most recently used
+                    stats["hits"] += 1
+                    return value
+
+            stats["misses"] += 1
+            generation = cleared[0]
+
+        # Computed outside of the lock, such that concurrent calls
+        # with different arguments don't wait on each other.
+        value = func(*args, **kwargs)
+
+        with lock:
+            if generation != cleared[0]:
+                # Possibly computed from what was just cleared
+                return value
+
+            cache[key] = (value, time.time())
+
+            while maxsize is not None and len(cache) > maxsize:
+                cache.popitem(last=False)
 
         return value
+
+    def cache_info():
+        with lock:
+            return dict(stats, size=len(cache), maxsize=maxsize)
+
+    def cache_clear():
+        with lock:
+            cache.clear()
+            cleared[0] += 1
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    _caches.append(wrapper)
+
     return wrapper
 
 
+def clear_caches():
+    """Invalidate every function decorated with `cached`"""
+    for wrapper in _caches:
+        wrapper.cache_clear()
+
+
+def html_to_text(html):
+    """Return `html` as plain text, e.g. for display in the console"""
+    return QtGui.QTextDocumentFragment.fromHtml(html).toPlainText()
+
+
+class LRU(object):
+    """Least recently used values, bounded by count and cost
+
+    Values are evicted once there are more than `maxsize` of them, or
+    their combined cost exceeds `maxcost`, least recently used first.
+
+    Arguments:
+        maxsize (int, optional): Maximum number of values,
+            None for unbounded
+        maxcost (int, optional): Maximum combined cost of values,
+            None for unbounded
+
+    """
+
+    def __init__(self, maxsize=None, maxcost=None):
+        self._maxsize = maxsize
+        self._maxcost = maxcost
+        self._values = collections.OrderedDict()  # key -> (value, cost)
+        self._cost = 0
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def cost(self):
+        return self._cost
+
+    def get(self, key, default=None):
+        try:
+            value, cost = self._values.pop(key)
+        except KeyError:
+            return default
+
+        self._values[key] = (value, cost)  # Most recently used
+        return value
+
+    def put(self, key, value, cost=0):
+        self.pop(key)
+        self._values[key] = (value, cost)
+        self._cost += cost
+
+        while self._values and (
+                (self._maxsize is not None and
+                 len(self._values) > self._maxsize) or
+                (self._maxcost is not None and
+                 self._cost > self._maxcost)):
+            _, (_, evicted) = self._values.popitem(last=False)
+            self._cost -= evicted
+
+    def pop(self, key, default=None):
+        try:
+            value, cost = self._values.pop(key)
+        except KeyError:
+            return default
+
+        self._cost -= cost
+        return value
+
+    def clear(self):
+        self._values.clear()
+        self._cost = 0
+
+
+class SingleFlight(object):
+    """Share one call amongst concurrent callers asking for the same thing
+
+    Whoever calls `do` first with a given key makes the call, anyone
+    else calling with that key in the meantime waits for and gets
+    its result, or exception. Once returned, the next call is made anew.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+
+    def do(self, key, target):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = {"done": threading.Event(),
+                        "result": None,
+                        "error": None}
+                self._calls[key] = call
+
+        if not leader:
+            call["done"].wait()
+
+            if call["error"] is not None:
+                raise call["error"]
+
+            return call["result"]
+
+        try:
+            call["result"] = target()
+
+        except Exception as e:
+            call["error"] = e
+            raise
+
+        finally:
+            with self._lock:
+                self._calls.pop(key)
+
+            call["done"].set()
+
+        return call["result"]
+
+    def __len__(self):
+        """Number of calls in flight"""
+        return len(self._calls)
+
+
 def windows_taskbar_compat():
     """Enable icon and taskbar grouping for Windows 7+"""
 
@@ -86,35 +271,297 @@ def windows_taskbar_compat():
             u"allzpark")
 
 
+class Cancelled(Exception):
+    """Raised by a deferred call stopping early, on having been cancelled"""
+
+
+class Job(object):
+    """A call submitted to a Pool, and its eventual result"""
+
+    def __init__(self, target, args=None, kwargs=None):
+        self.target = target
+        self.args = args or list()
+        self.kwargs = kwargs or dict()
+        self.traceback = None
+
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def run(self):
+        try:
+            self._result = self.target(*self.args, **self.kwargs)
+
+        except Exception as e:
+            self._error = e
+            self.traceback = traceback.format_exc()
+
+        finally:
+            self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def result(self, timeout=None):
+        """Block until finished, re-raising any exception from `target`"""
+        self._done.wait(timeout)
+
+        if self._error is not None:
+            raise self._error
+
+        return self._result
+
+
+class Pool(object):
+    """Run calls on a bounded number of threads
+
+    Threads are started on demand and exit once idle for `idle`
+    seconds, such that a pool may be kept for the lifetime of the
+    application without holding on to threads. Queued calls are
+    started lowest `priority` first, and in order of submission
+    amongst equals.
+
+    Calls made by a thread of the pool itself are run on that same
+    thread, rather than waiting on the threads they'd be queued for.
+
+    Arguments:
+        workers (int): Maximum number of concurrent threads
+        idle (float): Seconds a thread waits for work before exiting
+
+    """
+
+    def __init__(self, workers=4, idle=5.0):
+        self._workers = max(1, workers or 1)
+        self._idle = idle
+        self._queue = six.moves.queue.PriorityQueue()
+        self._lock = threading.Lock()
+        self._count = 0
+        self._order = itertools.count()
+        self._local = threading.local()
+
+    def submit(self, target, args=None, kwargs=None, priority=0):
+        job = Job(target, args, kwargs)
+
+        if not USE_THREADING or getattr(self._local, "worker", False):
+            job.run()
+            return job
+
+        self._queue.put((priority, next(self._order), job))
+
+        with self._lock:
+            if self._count < self._workers:
+                self._count += 1
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+
+        return job
+
+    def map(self, target, iterable, key=None):
+        """Call `target` with each item of `iterable`, results in order
+
+        Arguments:
+            target (callable): Called with each item
+            iterable (iterable): Items to call `target` with
+            key (callable, optional): Priority of an item, lowest first
+
+        """
+
+        items = list(iterable)
+        priorities = [key(item) if key else 0 for item in items]
+        jobs = [None] * len(items)
+
+        # Submit in order of priority, such that idle threads
+        # don't pick up a lesser item before the rest is queued
+        for index in sorted(range(len(items)), key=priorities.__getitem__):
+            jobs[index] = self.submit(target, [items[index]],
+                                      priority=priorities[index])
+
+        return [job.result() for job in jobs]
+
+    def _work(self):
+        self._local.worker = True
+
+        while True:
+            try:
+                _, _, job = self._queue.get(timeout=self._idle)
+
+            except six.moves.queue.Empty:
+                with self._lock:
+                    # A job may have arrived whilst we were timing out
+                    if self._queue.empty():
+                        self._count -= 1
+                        return
+
+                continue
+
+            job.run()
+
+
+class Future(QtCore.QObject):
+    """Handle on a call deferred with `defer`
+
+    Callbacks are delivered on the thread calling `defer`, and
+    never once `cancel` has been called.
+
+    """
+
+    succeeded = QtCore.Signal(object)
+    failed = QtCore.Signal(Exception, _basestring)
+    progressed = QtCore.Signal(object)
+    finished = QtCore.Signal()
+
+    def __init__(self,
+                 on_success=None,
+                 on_failure=None,
+                 on_progress=None,
+                 parent=None):
+        super(Future, self).__init__(parent)
+
+        self.on_success = on_success
+        self.on_failure = on_failure
+        self.on_progress = on_progress
+
+        self._cancelled = False
+        self._done = False
+
+        connection = QtCore.Qt.BlockingQueuedConnection
+        self.succeeded.connect(self._on_succeeded, type=connection)
+        self.failed.connect(self._on_failed, type=connection)
+
+        # Progress is reported without waiting on the receiving
+        # thread, but is always delivered ahead of the result
+        connection = QtCore.Qt.QueuedConnection
+        self.progressed.connect(self._on_progressed, type=connection)
+
+    def progress(self, value):
+        """Pass `value` to `on_progress`, from any thread"""
+        if USE_THREADING:
+            self.progressed.emit(value)
+        else:
+            self._on_progressed(value)
+
+    def cancel(self):
+        """Skip this call if not yet started, and drop its result"""
+        self._cancelled = True
+
+    def cancelled(self):
+        return self._cancelled
+
+    def done(self):
+        return self._done
+
+    def _on_succeeded(self, result):
+        self._done = True
+
+        if not self._cancelled and self.on_success is not None:
+            self.on_success(result)
+
+    def _on_failed(self, error, trace):
+        self._done = True
+
+        if not self._cancelled and self.on_failure is not None:
+            self.on_failure(error, trace)
+
+    def _on_progressed(self, value):
+        if not self._cancelled and self.on_progress is not None:
+            self.on_progress(value)
+
+
+class Generation(object):
+    """Keep only the most recent of a series of deferred calls
+
+    Passing the same generation to subsequent calls to `defer`
+    cancels whichever call came before it, such that results from
+    e.g. a previously selected profile never overwrite the current one.
+
+    """
+
+    def __init__(self):
+        self._current = None
+
+    def replace(self, future):
+        previous, self._current = self._current, future
+
+        if previous is not None:
+            previous.cancel()
+
+    def is_current(self, future):
+        return future is self._current
+
+
+_pool = Pool(workers=8)
+_futures = set()
+
+
 if USE_THREADING:
     def defer(target,
               args=None,
               kwargs=None,
               on_success=lambda object: None,
-              on_failure=lambda exception: None):
+              on_failure=lambda exception: None,
+              on_progress=None,
+              generation=None,
+              cancellable=False,
+              pool=None):
         """Perform operation in thread with callback
 
         Arguments:
             target (callable): Method or function to call
-            callback (callable, optional): Method or function to call
-                once `target` has finished.
+            on_success (callable, optional): Method or function to call
+                with the return value of `target`
+            on_failure (callable, optional): Method or function to call
+                with the exception and traceback raised by `target`
+            on_progress (callable, optional): Method or function to call
+                with each value `target` passes to its `progress` argument
+            generation (Generation, optional): Cancel any prior call
+                made with this generation
+            cancellable (bool, optional): Pass `target` a `cancelled`
+                argument, for it to check every now and then and raise
+                `Cancelled` once true
+            pool (Pool, optional): Perform operation on these threads,
+                rather than those shared by every other operation
 
         Returns:
-            None
+            Future
 
         """
 
-        thread = Thread(target, args, kwargs, on_success, on_failure)
-        thread.finished.connect(lambda: _threads.remove(thread))
-        thread.start()
+        future = Future(on_success, on_failure, on_progress)
+
+        if on_progress is not None:
+            kwargs = dict(kwargs or {}, progress=future.progress)
 
-        # Cache until finished
-        # If we didn't do this, Python steps in to garbage
-        # collect the thread before having had time to finish,
-        # resulting in an exception.
-        _threads.append(thread)
+        if cancellable:
+            kwargs = dict(kwargs or {}, cancelled=future.cancelled)
 
-        return thread
+        if generation is not None:
+            generation.replace(future)
+
+        def run():
+            if future.cancelled():
+                return future.finished.emit()
+
+            try:
+                result = target(*(args or []), **(kwargs or {}))
+
+            except Exception as e:
+                error = traceback.format_exc()
+                future.failed.emit(e, error)
+
+            else:
+                future.succeeded.emit(result)
+
+            future.finished.emit()
+
+        # Keep a reference until finished, else Python steps in to
+        # garbage collect the future before it has had time to finish.
+        _futures.add(future)
+        future.finished.connect(lambda: _futures.discard(future))
+
+        (pool or _pool).submit(run)
+
+        return future
 
 else:
     # Debug mode, execute "threads" immediately on the main thread
@@ -124,52 +571,31 @@ else:
               args=None,
               kwargs=None,
               on_success=lambda object: None,
-              on_failure=lambda exception: None):
-        try:
-            result = target(*(args or []), **(kwargs or {}))
-        except Exception as e:
-            error = traceback.format_exc()
-            on_failure(e, error)
-        else:
-            on_success(result)
+              on_failure=lambda exception: None,
+              on_progress=None,
+              generation=None,
+              cancellable=False,
+              pool=None):
+        future = Future(on_success, on_failure, on_progress)
 
+        if on_progress is not None:
+            kwargs = dict(kwargs or {}, progress=future.progress)
 
-class Thread(QtCore.QThread):
-    succeeded = QtCore.Signal(object)
-    failed = QtCore.Signal(Exception, _basestring)
+        if cancellable:
+            kwargs = dict(kwargs or {}, cancelled=future.cancelled)
 
-    def __init__(self,
-                 target,
-                 args=None,
-                 kwargs=None,
-                 on_success=None,
-                 on_failure=None):
-        super(Thread, self).__init__()
+        if generation is not None:
+            generation.replace(future)
 
-        self.args = args or list()
-        self.kwargs = kwargs or dict()
-        self.target = target
-        self.on_success = on_success
-        self.on_failure = on_failure
-
-        connection = QtCore.Qt.BlockingQueuedConnection
-
-        if on_success is not None:
-            self.succeeded.connect(self.on_success, type=connection)
-
-        if on_failure is not None:
-            self.failed.connect(self.on_failure, type=connection)
-
-    def run(self, *args, **kwargs):
         try:
-            result = self.target(*self.args, **self.kwargs)
-
+            result = target(*(args or []), **(kwargs or {}))
         except Exception as e:
             error = traceback.format_exc()
-            return self.failed.emit(e, error)
-
+            future._on_failed(e, error)
         else:
-            self.succeeded.emit(result)
+            future._on_succeeded(result)
+
+        return future
 
 
 def iterable(arg):
@@ -37,10 +37,11 @@ class Applications(dock.SlimTableView):
         # To avoid that, we need to block view selection signal when editor
         # is created, and unblock it depend on version changed or not.
         # If version isn't changed, unblock it once editor is closed, and
-        # wait for controller reset signal after patch completed if changed.
+        # wait for controller refresh signal after patch completed if changed.
         delegate.editor_created.connect(self.on_editor_created)
         delegate.editor_closed.connect(self.on_editor_done)
         ctrl.resetted.connect(lambda: self.on_editor_done(False))
+        ctrl.refreshed.connect(lambda: self.on_editor_done(False))
 
         self._selected_app_ok = False
 
@@ -323,7 +324,8 @@ class Window(QtWidgets.QMainWindow):
         selection_model = widgets["apps"].selectionModel()
         selection_model.selectionChanged.connect(self.on_app_selection_changed)
 
-        ctrl.models["apps"].modelReset.connect(self.on_apps_reset)
+        ctrl.models["apps"].modelReset.connect(self.on_apps_changed)
+        ctrl.models["apps"].dataChanged.connect(self.on_apps_changed)
         ctrl.models["profiles"].modelReset.connect(
             self.on_profilename_reset)
         ctrl.models["profileVersions"].modelReset.connect(
@@ -353,7 +355,13 @@ class Window(QtWidgets.QMainWindow):
 
     def eventFilter(self, obj, event):
         """Forward tooltips to status bar whenever the mouse moves"""
-        if event.type() == QtCore.QEvent.MouseMove:
+        if event.type() in (QtCore.QEvent.MouseButtonPress,
+                            QtCore.QEvent.KeyPress,
+                            QtCore.QEvent.Wheel):
+            # Leave the user undisturbed by any background work
+            self._ctrl.interrupt_prefetch()
+
+        elif event.type() == QtCore.QEvent.MouseMove:
             try:
                 tooltip = obj.toolTip()
 
@@ -506,6 +514,9 @@ class Window(QtWidgets.QMainWindow):
         if key == "showAllVersions":
             self._ctrl.select_application(self._ctrl.state["appRequest"])
 
+        if key == "clearCacheTimeout":
+            self._ctrl.set_cache_timeout(value)
+
         if key == "exclusionFilter":
             allzparkconfig.exclude_filter = value
             self._ctrl.reset()
@@ -650,11 +661,13 @@ class Window(QtWidgets.QMainWindow):
         toggle.setIconSize(QtCore.QSize(width, height))
         toggle.setAutoFillBackground(True)
 
-    def on_repository_changed(self):
-        self.reset()
+    def on_repository_changed(self, families):
+        self._ctrl.refresh(families)
 
     def on_show_error(self):
-        self._docks["console"].append(self._ctrl.current_error)
+        # Those of the "noapps" page are formatted as HTML
+        html = self._ctrl.state.state == "noapps"
+        self._docks["console"].append(self._ctrl.current_error, html=html)
         self._docks["console"].raise_()
 
     def tell(self, message, level=logging.INFO):
@@ -678,7 +691,7 @@ class Window(QtWidgets.QMainWindow):
             widget.setEnabled(True)
 
         if page_name == "home":
-            self._widgets["apps"].setEnabled(state == "ready")
+            self._widgets["apps"].setEnabled(state in ("ready", "resolving"))
 
         elif page_name == "noapps":
             message = self._ctrl.state["error"]
@@ -730,23 +743,44 @@ class Window(QtWidgets.QMainWindow):
     def on_profileversion_reset(self):
         pass
 
-    def on_apps_reset(self):
-        app = self._ctrl.state.retrieve("startupApplication")
+    def on_apps_changed(self, *args):
+        """Select the startup application, as soon as it has resolved"""
+
+        view = self._widgets["apps"]
+
+        if view.selectionModel().hasSelection():
+            return
+
+        app = self._ctrl.state.retrieve("startupApplication") or ""
+        family = app.split("==", 1)[0]
 
         row = 0
+        found = False
         model = self._ctrl.models["apps"]
 
-        if app:
-            for row_ in range(model.rowCount()):
-                index = model.index(row_, 0, QtCore.QModelIndex())
-                name = model.data(index, "name")
+        for row_ in range(model.rowCount()):
+            index = model.index(row_, 0, QtCore.QModelIndex())
+
+            if family and model.data(index, "family") == family:
+                row = row_
+                found = True
+                break
+
+        index = model.index(row, 0, QtCore.QModelIndex())
+
+        if model.data(index, "resolving") in (None, True):
+            # Either no applications, or not yet resolved
+            return
+
+        if model.data(index, "stale"):
+            # Still from the previous session
+            return
 
-                if app == name:
-                    row = row_
-                    self.tell("Using startup application %s" % name)
-                    break
+        if found:
+            self.tell("Using startup application %s"
+                      % model.data(index, "name"))
 
-        self._widgets["apps"].selectRow(row)
+        view.selectRow(row)
 
     def on_app_clicked(self, index):
         """An app was double-clicked or Return was hit"""
@@ -795,6 +829,7 @@ class Window(QtWidgets.QMainWindow):
     def closeEvent(self, event):
         self._ctrl.state.store("geometry", self.saveGeometry())
         self._ctrl.state.store("windowState", self.saveState())
+        self._ctrl.save_session()
         for timer in self._ctrl.timers.values():
             timer.stop()
         return super(Window, self).closeEvent(event)
@@ -0,0 +1,220 @@
+"""Headless benchmark of resolving profiles and applications
+
+Generates a synthetic in-memory repository and times the controller
+across the operations a user performs most often. Results are written
+as JSON, such that runs may be compared across commits.
+
+Usage:
+    $ python -m tests.benchmark --output before.json
+    $ git checkout my-branch
+    $ python -m tests.benchmark --output after.json --compare before.json
+
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+from tests import util
+
+
+def generate(profiles=10, apps=5, depth=3):
+    """Return packages for `util.memory_repository`
+
+    Each profile references every app, and each app
+    requires a chain of `depth` libraries.
+
+    """
+
+    packages = {}
+
+    def add(name, requires=None, commands=None):
+        packages[name] = {
+            "1.0.0": {
+                "name": name,
+                "version": "1.0.0",
+                "requires": requires or [],
+                "commands": commands or "env.%s='1'" % name.upper(),
+            }
+        }
+
+    for app in range(apps):
+        libs = ["lib_%d_%d" % (app, level) for level in range(depth)]
+
+        for level, lib in enumerate(libs):
+            add(lib, libs[level + 1:level + 2])
+
+        add("app_%d" % app, libs[:1])
+
+    for profile in range(profiles):
+        add("profile_%d" % profile,
+            ["~app_%d" % app for app in range(apps)])
+
+    return packages
+
+
+class Benchmark(object):
+    def __init__(self, ctrl, repeat=3, timeout=60000):
+        self._ctrl = ctrl
+        self._repeat = repeat
+        self._timeout = timeout
+        self.results = {}
+
+    def wait(self, signal, on_value=None):
+        from allzpark.vendor.Qt import QtCore
+
+        loop = QtCore.QEventLoop()
+        state = {"received": False}
+
+        def trigger(*args):
+            if on_value is None or (args and args[0] == on_value):
+                state["received"] = True
+                loop.quit()
+
+        signal.connect(trigger)
+        QtCore.QTimer.singleShot(self._timeout, loop.quit)
+
+        try:
+            if not state["received"]:
+                loop.exec_()
+        finally:
+            signal.disconnect(trigger)
+
+        if not state["received"]:
+            raise RuntimeError("Timed out waiting for %s" % signal)
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        t0 = time.time()
+        yield
+        self.results.setdefault(name, []).append(time.time() - t0)
+
+    def run(self, profiles):
+        from allzpark.vendor.Qt import QtCore
+
+        ctrl = self._ctrl
+
+        for _ in range(self._repeat):
+            with self.measure("reset"):
+                QtCore.QTimer.singleShot(0, lambda: ctrl.reset(profiles))
+                self.wait(ctrl.resetted)
+
+            # Reset proceeds onto selecting a profile
+            self.wait(ctrl.state_changed, "ready")
+
+            for profile in profiles:
+                with self.measure("select_profile"):
+                    QtCore.QTimer.singleShot(
+                        0, lambda: ctrl.select_profile(profile))
+                    self.wait(ctrl.state_changed, "ready")
+
+            for app_request in list(ctrl.state["rezContexts"]):
+                with self.measure("select_application"):
+                    ctrl.select_application(app_request)
+
+                ctrl.state["rezEnvirons"].clear()
+
+                with self.measure("environ"):
+                    ctrl.environ(app_request)
+
+        return {
+            name: {
+                "runs": len(durations),
+                "min": min(durations),
+                "mean": sum(durations) / len(durations),
+                "max": max(durations),
+            }
+            for name, durations in self.results.items()
+        }
+
+
+def compare(results, baseline, threshold):
+    """Print relative change per operation, return regressed names"""
+
+    regressed = []
+
+    for name, result in sorted(results.items()):
+        try:
+            before = baseline[name]["mean"]
+        except KeyError:
+            print("%-20s %8.4fs (new)" % (name, result["mean"]))
+            continue
+
+        change = (result["mean"] - before) / before if before else 0.0
+        print("%-20s %8.4fs -> %8.4fs (%+.0f%%)" % (
+            name, before, result["mean"], change * 100))
+
+        if change > threshold:
+            regressed.append(name)
+
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser("benchmark", description=__doc__,
+                                     formatter_class=argparse.
+                                     RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", type=int, default=10)
+    parser.add_argument("--apps", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results to this file")
+    parser.add_argument("--compare", help="Compare against these results")
+    parser.add_argument("--threshold", type=float, default=0.2, help=(
+        "Fail when an operation is this much slower than --compare"))
+
+    opts = parser.parse_args()
+
+    os.environ["ALLZPARK_PREFERENCES_NAME"] = "preferences_benchmark"
+    os.environ["REZ_PACKAGES_PATH"] = util.MEMORY_LOCATION
+
+    from allzpark import cli, allzparkconfig
+
+    # Measure resolves, rather than reading them off of disk
+    allzparkconfig.context_cache_location = lambda: ""
+
+    # ..or restoring them from memory, or loading them ahead of time
+    allzparkconfig.profile_cache_size = 0
+    allzparkconfig.prefetch_favorites = False
+
+    app, ctrl = cli.initialize(clean=True, no_config=True)
+
+    util.memory_repository(generate(opts.profiles, opts.apps, opts.depth))
+    profiles = ["profile_%d" % index for index in range(opts.profiles)]
+
+    results = Benchmark(ctrl, repeat=opts.repeat).run(profiles)
+
+    output = {
+        "parameters": {
+            "profiles": opts.profiles,
+            "apps": opts.apps,
+            "depth": opts.depth,
+            "repeat": opts.repeat,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(output, indent=4, sort_keys=True)
+
+    if opts.output:
+        with open(opts.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)["results"]
+
+        regressed = compare(results, baseline, opts.threshold)
+
+        if regressed:
+            print("Regressed: %s" % ", ".join(regressed))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
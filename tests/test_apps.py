@@ -36,6 +36,10 @@ class TestApps(util.TestBase):
         with self.wait_signal(self.ctrl.state_changed, "ready"):
             self.ctrl.select_profile("foo")
 
+        # Environments are only computed whilst being looked at
+        with self.wait_signal(self.ctrl.environ_changed, "app_A==1.0.0"):
+            self.show_dock("environment")
+
         env = self.ctrl.state["rezEnvirons"]
 
         # first app will be selected if no preference loaded
@@ -43,7 +47,8 @@ class TestApps(util.TestBase):
         self.assertIn("app_A==1.0.0", env)
         self.assertNotIn("app_B==1.0.0", env)
 
-        self.ctrl.select_application("app_B==1.0.0")
+        with self.wait_signal(self.ctrl.environ_changed, "app_B==1.0.0"):
+            self.ctrl.select_application("app_B==1.0.0")
 
         self.assertEqual("app_B==1.0.0", self.ctrl.state["appRequest"])
         self.assertIn("app_A==1.0.0", env)
@@ -89,6 +94,9 @@ class TestApps(util.TestBase):
         for app_request in ["app_A==1.0.0", "app_B==1.0.0"]:
             self.ctrl.select_application(app_request)
 
+            with self.wait_signal(self.ctrl.environ_changed, app_request):
+                self.ctrl.request_environ()
+
         self.assertIn("app_A==1.0.0", env)
         self.assertIn("app_B==1.0.0", env)
 
@@ -104,6 +112,33 @@ class TestApps(util.TestBase):
         self.assertIn("THIS_B", env["app_B==1.0.0"])
         self.assertNotIn("THIS_B", env["app_A==1.0.0"])
 
+    def test_app_environ_on_demand(self):
+        """Test environment is computed only once the dock is visible
+        """
+        util.memory_repository({
+            "foo": {
+                "1.0.0": {
+                    "name": "foo",
+                    "version": "1.0.0",
+                    "requires": ["~app_A"],
+                }
+            },
+            "app_A": {"1.0.0": {"name": "app_A", "version": "1.0.0"}},
+        })
+        self.ctrl_reset(["foo"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+        self.wait(timeout=200)
+
+        env = self.ctrl.state["rezEnvirons"]
+        self.assertNotIn("app_A==1.0.0", env)
+
+        with self.wait_signal(self.ctrl.environ_changed, "app_A==1.0.0"):
+            self.show_dock("environment")
+
+        self.assertIn("app_A==1.0.0", env)
+
     def test_app_failed_independently_1(self):
         """Test app resolve failure doesn't fail whole profile"""
         util.memory_repository({
@@ -361,3 +396,625 @@ class TestApps(util.TestBase):
         resolved_pkgs = [p for p in context_a.resolved_packages
                          if "app_A" == p.name and "1.0.0" == str(p.version)]
         self.assertEqual(1, len(resolved_pkgs))
+
+    def test_app_incremental_refresh(self):
+        """Test only apps affected by a repository change are re-resolved"""
+        packages = {
+            "foo": {
+                "1": {
+                    "name": "foo",
+                    "version": "1",
+                    "requires": ["~app_A", "~app_B"],
+                }
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1",
+                            "requires": ["lib_B"]}},
+            "lib_B": {"1": {"name": "lib_B", "version": "1"}},
+        }
+        util.memory_repository(packages)
+        self.ctrl_reset(["foo"])
+
+        self.select_application("app_B==1")
+        context_a = self.ctrl.state["rezContexts"]["app_A==1"]
+
+        packages["lib_B"]["2"] = {"name": "lib_B", "version": "2"}
+        packages["app_B"]["2"] = {"name": "app_B", "version": "2",
+                                  "requires": ["lib_B-2"]}
+        util.memory_repository(packages)
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.refresh({"lib_B", "app_B"})
+        self.wait(200)
+
+        # Unaffected contexts are kept as-is, and in order
+        self.assertEqual(["app_A==1", "app_B==2"],
+                         list(self.ctrl.state["rezContexts"]))
+        self.assertIs(context_a, self.ctrl.state["rezContexts"]["app_A==1"])
+
+        # Rows are updated in place, including the current application
+        model = self.ctrl.models["apps"]
+        self.assertEqual(["app_A==1", "app_B==2"],
+                         [item["name"] for item in model.items])
+        self.assertEqual("app_B==2", self.ctrl.state["appRequest"])
+
+        packages_model = self.ctrl.models["packages"]
+        lib_b = packages_model.find("lib_B")
+        self.assertEqual("2", lib_b["version"])
+
+    def test_app_patch_targeted(self):
+        """Test patches apply alike, however applications are resolved"""
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1",
+                            "requires": ["lib"]}},
+            "app_B": {"1": {"name": "app_B", "version": "1"},
+                      "2": {"name": "app_B", "version": "2"}},
+            "lib": {"1": {"name": "lib", "version": "1"},
+                    "2": {"name": "lib", "version": "2"}},
+        })
+        self.ctrl_reset(["foo"])
+
+        def resolved():
+            return [
+                sorted(pkg.qualified_package_name
+                       for pkg in context.resolved_packages)
+                for context in self.ctrl.state["rezContexts"].values()
+            ]
+
+        self.select_application("app_B==2")
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.patch("lib==1")
+
+        # Added to every application, like when loading the profile
+        patched = resolved()
+        self.assertEqual([["app_A-1", "foo-1", "lib-1"],
+                          ["app_B-2", "foo-1", "lib-1"]], patched)
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        self.assertEqual(patched, resolved())
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.patch("lib")
+
+        self.assertEqual("", self.ctrl.state.retrieve("patch"))
+        self.assertEqual([["app_A-1", "foo-1", "lib-2"],
+                          ["app_B-2", "foo-1"]], resolved())
+
+        # Subtractions leave applications without the family be
+        self.select_application("app_B==2")
+        context_b = self.ctrl.state["rezContexts"]["app_B==2"]
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.set_patch("^lib")
+
+        self.assertIs(context_b, self.ctrl.state["rezContexts"]["app_B==2"])
+        self.assertEqual("app_B==2", self.ctrl.state["appRequest"])
+
+    def test_app_refresh_broken(self):
+        """Test refreshing alongside an application that failed to resolve"""
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1",
+                            "requires": ["missing"]}},
+        })
+        self.ctrl_reset(["foo"])
+
+        contexts = self.ctrl.state["rezContexts"]
+        self.assertFalse(contexts["app_B==1"].success)
+        context_b = contexts["app_B==1"]
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.refresh({"app_A"})
+
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         list(self.ctrl.state["rezContexts"]))
+        self.assertIs(context_b, self.ctrl.state["rezContexts"]["app_B==1"])
+
+    def test_app_patch_added(self):
+        """Test patching a family no application involves adds it to all"""
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+            "extra": {"1": {"name": "extra", "version": "1"}},
+        })
+        self.patch_allzparkconfig("patch_single_solve", False)
+        self.ctrl_reset(["foo"])
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.set_patch("extra")
+
+        contexts = list(self.ctrl.state["rezContexts"].values())
+
+        for context in contexts:
+            self.assertIn("extra", [
+                pkg.name for pkg in context.resolved_packages])
+
+        # Resolving the patched request in one go gives the same result
+        self.patch_allzparkconfig("patch_single_solve", True)
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.set_patch("")
+
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.set_patch("extra")
+
+        self.assertEqual(
+            [[str(pkg) for pkg in context.resolved_packages]
+             for context in contexts],
+            [[str(pkg) for pkg in context.resolved_packages]
+             for context in self.ctrl.state["rezContexts"].values()])
+
+    def test_app_patch_single_solve(self):
+        """Test patched applications are resolved once each"""
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1",
+                            "requires": ["lib"]}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+            "lib": {"1": {"name": "lib", "version": "1"},
+                    "2": {"name": "lib", "version": "2"}},
+        })
+
+        requests = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            pinned = " (pinned)" if kwargs.get("pins") else ""
+            requests.append(" ".join(map(str, request)) + pinned)
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+        self.ctrl.state.store("patch", "lib==1")
+        self.ctrl_reset(["foo"])
+
+        self.assertEqual(["foo-1",
+                          "foo-1 app_A==1 lib==1 (pinned)",
+                          "foo-1 app_B==1 lib==1 (pinned)"], sorted(requests))
+
+        # Same as patching each resolve, adding it where it wasn't before
+        contexts = self.ctrl.state["rezContexts"]
+        for app_request in ("app_A==1", "app_B==1"):
+            self.assertIn("lib==1", [
+                "%s==%s" % (pkg.name, pkg.version)
+                for pkg in contexts[app_request].resolved_packages])
+
+        # Patches failing to resolve fall back onto the original resolve
+        del requests[:]
+        with self.wait_signal(self.ctrl.refreshed):
+            self.ctrl.set_patch("lib==3")
+
+        self.assertEqual(["foo-1"] + [
+            request % app
+            for app in ("app_A==1", "app_B==1")
+            for request in ("foo-1 %s lib==3 (pinned)",
+                            "foo-1 %s (pinned)",
+                            "foo-1 %s lib==3 (pinned)")
+        ], sorted(requests, key=lambda request: request.split()[1:2]))
+
+    def test_app_pinned_to_profile(self):
+        """Test apps reuse profile versions, unless requiring others"""
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["lib", "~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1",
+                            "requires": ["lib"]}},
+            "app_B": {"1": {"name": "app_B", "version": "1",
+                            "requires": ["lib-1"]}},
+            "lib": {"1": {"name": "lib", "version": "1"},
+                    "2": {"name": "lib", "version": "2"}},
+        })
+        self.ctrl_reset(["foo"])
+
+        def lib_version(app_request):
+            context = self.ctrl.state["rezContexts"][app_request]
+            return next(str(pkg.version)
+                        for pkg in context.resolved_packages
+                        if pkg.name == "lib")
+
+        self.assertEqual("2", lib_version("app_A==1"))
+        self.assertEqual("1", lib_version("app_B==1"))
+
+    def test_app_streamed(self):
+        """Test apps are listed as they resolve, and selectable right away"""
+        import threading
+        from allzpark import util as allzpark_util
+
+        if not allzpark_util.USE_THREADING:
+            self.skipTest("Resolves happen one at a time without threading")
+
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+        })
+        self.ctrl_reset(["foo"])
+
+        release = threading.Event()
+        env = self.ctrl.env
+
+        def slow(request, *args, **kwargs):
+            if "app_B==1" in map(str, request):
+                release.wait(5)
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = slow
+        self.ctrl.state.store("startupApplication", "app_A==1")
+
+        with self.wait_signal(self.ctrl.application_changed):
+            self.ctrl.select_profile("foo")
+
+        try:
+            model = self.ctrl.models["apps"]
+            self.assertEqual("resolving", self.ctrl.state.state)
+            self.assertEqual("app_A==1", self.ctrl.state["appRequest"])
+            self.assertFalse(model.find("app_A==1")["resolving"])
+            self.assertTrue(model.find("app_B")["resolving"])
+
+        finally:
+            release.set()
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            pass
+
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         [item["name"] for item in model.items])
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         list(self.ctrl.state["rezContexts"]))
+
+    def test_app_resolve_priority(self):
+        """Test startup and recently used apps are resolved first"""
+        from allzpark import util as allzpark_util
+
+        util.memory_repository({
+            "foo": {
+                "1": {"name": "foo", "version": "1",
+                      "requires": ["~app_A", "~app_B", "~app_C"]}
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+            "app_C": {"1": {"name": "app_C", "version": "1"}},
+        })
+        self.ctrl_reset(["foo"])
+
+        order = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            order.append(str(request[-1]))
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+        self.ctrl._pools["resolve"] = allzpark_util.Pool(workers=1)
+        self.ctrl.state.store("startupApplication", "app_C==1")
+        self.ctrl.state.store("app/app_A==1/lastUsed", 100.0)
+        self.ctrl.state.store("app/app_B==1/lastUsed", 200.0)
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        self.assertEqual(["app_C==1", "app_B==1", "app_A==1"],
+                         [request for request in order
+                          if request.startswith("app_")])
+
+        # Listed in the order of the profile regardless
+        self.assertEqual(["app_A==1", "app_B==1", "app_C==1"],
+                         list(self.ctrl.state["rezContexts"]))
+
+    def test_app_resolve_parallel(self):
+        """Test apps resolved in parallel are listed in the profile's order"""
+        import time
+        import threading
+        from allzpark import util as allzpark_util
+
+        names = ["app_D", "app_A", "app_C", "app_B"]
+        packages = {
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~%s" % name for name in names]}},
+        }
+        for name in names:
+            packages[name] = {"1": {"name": name, "version": "1"}}
+
+        util.memory_repository(packages)
+        self.ctrl_reset(["foo"])
+
+        threads = set()
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            if len(request) > 1:
+                threads.add(threading.current_thread())
+
+                # Those listed first finish last
+                time.sleep(0.05 * (len(names) - names.index(
+                    str(request[-1]).split("==")[0])))
+
+            return env(request, *args, **kwargs)
+
+        messages = []
+        self.ctrl.logged.connect(lambda message, level: messages.append(
+            message))
+
+        # Ready once every application is in place, not before
+        ready = []
+        self.ctrl.state_changed.connect(
+            lambda state: ready.append(list(self.ctrl.state["rezContexts"]))
+            if state == "ready" else None)
+
+        self.ctrl.env = record
+        self.ctrl._pools["resolve"] = allzpark_util.Pool(workers=4)
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+        self.wait(timeout=200)
+
+        self.assertEqual([["%s==1" % name for name in names]], ready)
+        self.assertEqual(["%s==1" % name for name in names],
+                         list(self.ctrl.state["rezContexts"]))
+        self.assertTrue(any(message.startswith("Resolved all contexts in")
+                            for message in messages))
+
+        if allzpark_util.USE_THREADING:
+            self.assertGreater(len(threads), 1)
+
+    def test_app_show_all_lazily(self):
+        """Test all apps are listed up-front, and resolved once selected"""
+        util.memory_repository({
+            "foo": {"1": {"name": "foo", "version": "1"}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+        })
+        self.patch_allzparkconfig("applications", ["app_A", "app_B"])
+        self.ctrl.state.store("showAllApps", True)
+        self.ctrl.state.store("startupApplication", "app_A==1")
+        self.ctrl_reset(["foo"])
+
+        model = self.ctrl.models["apps"]
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         [item["name"] for item in model.items])
+        self.assertEqual(["app_A==1"], list(self.ctrl.state["rezContexts"]))
+
+        with self.wait_signal(self.ctrl.application_changed):
+            self.select_application("app_B==1")
+
+        self.assertEqual("app_B==1", self.ctrl.state["appRequest"])
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         sorted(self.ctrl.state["rezContexts"]))
+
+        # Resolved contexts are kept for the remainder of the session
+        requests = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            requests.append(request)
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        self.wait(200)
+        self.assertEqual("app_B==1", self.ctrl.state["appRequest"])
+        self.assertEqual([["foo-1"]], [list(map(str, request))
+                                       for request in requests])
+
+    def test_app_profile_restored(self):
+        """Test returning to a recently loaded profile skips resolving"""
+        util.memory_repository({
+            "bar": {"1": {"name": "bar", "version": "1",
+                          "requires": ["~app_A"]}},
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A", "~app_B"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+        })
+        self.ctrl_reset(["foo", "bar"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        contexts = dict(self.ctrl.state["rezContexts"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("bar")
+
+        requests = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            requests.append(request)
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        self.assertEqual([], requests)
+        self.assertEqual(["app_A==1", "app_B==1"],
+                         [item["name"]
+                          for item in self.ctrl.models["apps"].items])
+        self.assertEqual(contexts["app_B==1"],
+                         self.ctrl.state["rezContexts"]["app_B==1"])
+
+        # Releases since are picked up in the background
+        util.memory_repository({
+            "bar": {"1": {"name": "bar", "version": "1",
+                          "requires": ["~app_A"]}},
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A", "~app_B"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"},
+                      "2": {"name": "app_B", "version": "2"}},
+        })
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("bar")
+
+        with self.wait_signal(self.ctrl.repository_changed):
+            self.ctrl.select_profile("foo")
+
+        self.wait(500)
+        self.assertIn("app_B==2", self.ctrl.state["rezContexts"])
+
+    def test_app_session_restored(self):
+        """Test the previous session is shown until loaded anew"""
+        util.memory_repository({
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A", "~app_B"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+            "app_C": {"1": {"name": "app_C", "version": "1"}},
+        })
+        self.ctrl_reset(["foo"])
+        self.ctrl.save_session()
+
+        # Next launch, with app_B replaced by app_C since
+        util.memory_repository({
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A", "~app_C"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+            "app_C": {"1": {"name": "app_C", "version": "1"}},
+        })
+        self.ctrl.state["rezProfiles"].clear()
+
+        model = self.ctrl.models["apps"]
+        restored = []
+        removed = []
+
+        def on_reset():
+            restored.append([(item["name"], item["stale"])
+                             for item in model.items])
+
+        model.modelReset.connect(on_reset)
+        model.rowsRemoved.connect(lambda *args: removed.append(args[1]))
+
+        self.ctrl_reset(["foo"])
+
+        # Shown as it was, and only ever reset the once
+        self.assertEqual([[("app_A==1", True), ("app_B==1", True)]],
+                         restored)
+        self.assertEqual([1], removed)
+        self.assertEqual([("app_A==1", False), ("app_C==1", False)],
+                         [(item["name"], item["stale"])
+                          for item in model.items])
+
+    def test_app_resolves_cancelled(self):
+        """Test switching profile stops resolving the previous one"""
+        import time
+        from allzpark import util as allzpark_util
+
+        if not allzpark_util.USE_THREADING:
+            self.skipTest("Resolves finish before returning without threading")
+
+        apps = ["app_%d" % index for index in range(6)]
+        packages = {
+            "bar": {"1": {"name": "bar", "version": "1",
+                          "requires": ["~app_0"]}},
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~" + app for app in apps]}},
+        }
+        for app in apps:
+            packages[app] = {"1": {"name": app, "version": "1"}}
+
+        util.memory_repository(packages)
+        self.ctrl_reset(["foo", "bar"])
+
+        requests = []
+        env = self.ctrl.env
+
+        def slow(request, *args, **kwargs):
+            requests.append(" ".join(map(str, request)))
+            time.sleep(0.1)
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = slow
+        self.ctrl._pools["resolve"] = allzpark_util.Pool(workers=1)
+
+        self.ctrl.select_profile("foo")
+
+        with self.wait_signal(self.ctrl.state_changed, "resolving"):
+            pass
+
+        with self.wait_signal(self.ctrl.state_changed, "ready", timeout=3000):
+            self.ctrl.select_profile("bar")
+
+        # Wait for anything still running to surface
+        self.wait(500)
+
+        self.assertEqual("bar", self.ctrl.state["profileName"])
+        self.assertEqual(["app_0==1"], list(self.ctrl.state["rezContexts"]))
+        self.assertEqual(["app_0==1"], [
+            item["name"] for item in self.ctrl.models["apps"].items])
+
+        # At most the application resolving at the time was finished
+        resolved = [request for request in requests
+                    if request.startswith("foo-1 app_")]
+        self.assertLess(len(resolved), 3)
+
+    def test_app_resolves_shared(self):
+        """Test concurrent resolves of the same request share one solve"""
+        import time
+        import threading
+        from unittest import mock
+        from allzpark import util as allzpark_util, control, _rezapi as rez
+
+        if not allzpark_util.USE_THREADING:
+            self.skipTest("Resolves never overlap without threading")
+
+        util.memory_repository({
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+        })
+        self.ctrl_reset(["foo"])
+        self.ctrl._cache = control.ContextCache("")
+
+        solves = []
+        results = []
+        env = rez.env
+
+        def slow(requests, *args, **kwargs):
+            solves.append(requests)
+            time.sleep(0.2)
+            return env(requests, *args, **kwargs)
+
+        def resolve():
+            results.append(self.ctrl.env(["foo", "app_A"]))
+
+        with mock.patch.object(rez, "env", slow):
+            threads = [threading.Thread(target=resolve) for _ in range(3)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual([["foo", "app_A"]], solves)
+        self.assertEqual(3, len(results))
+        self.assertEqual(1, len(set(map(id, results))))
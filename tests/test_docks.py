@@ -99,3 +99,65 @@ class TestDocks(util.TestBase):
 
                 self.wait(200)
                 menu.close()
+
+    def test_console_line_limit_and_filter(self):
+        """Test console keeps a bounded number of lines, filtered by level"""
+        import logging
+
+        self.patch_allzparkconfig("console_line_limit", 5)
+        from allzpark import dock as dock_
+
+        console = dock_.Console()
+        for index in range(4):
+            console.append("debug %d" % index, logging.DEBUG)
+        console.append("warning\nerror", logging.WARNING)
+
+        source = console._models["source"]
+        proxy = console._models["proxy"]
+        self.assertEqual(5, source.rowCount())
+        self.assertEqual(
+            ["debug 1", "debug 2", "debug 3", "warning", "error"],
+            [message for message, level in source.items]
+        )
+
+        console._widgets["level"].setCurrentIndex(2)  # Warning
+        self.assertEqual(2, proxy.rowCount())
+
+        console._widgets["search"].setText("err")
+        self.assertEqual(1, proxy.rowCount())
+
+    def test_console_plain_text(self):
+        """Test console only reads messages known to be HTML as such"""
+        from allzpark import dock as dock_
+
+        console = dock_.Console()
+        line = ('  File "<string>", line 1, in <module>\n'
+                'ValueError: a < b and c > d')
+        console.append(line)
+        console.append("<h2>:(</h2>Not found", html=True)
+
+        self.assertEqual(line.split("\n") + [":(", "Not found"], [
+            message for message, level in console._models["source"].items])
+
+    def test_environment_failed(self):
+        """Test environment dock shows why an environment failed"""
+        util.memory_repository({
+            "foo": {
+                "1.0.0": {
+                    "name": "foo",
+                    "version": "1.0.0",
+                    "requires": ["~app_A"],
+                },
+            },
+            "app_A": {"1": {"name": "app_A", "version": "1",
+                            "commands": "raise ValueError('Broken')"}},
+        })
+        self.ctrl_reset(["foo"])
+        self.select_application("app_A==1")
+
+        with self.wait_signal(self.ctrl.environ_failed):
+            dock = self.show_dock("environment", on_page="environment")
+
+        stack = dock._widgets["stack"]
+        self.assertIs(dock._widgets["failed"], stack.currentWidget())
+        self.assertIn("Broken", dock._widgets["failed"].text())
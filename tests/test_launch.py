@@ -53,3 +53,52 @@ class TestLaunch(util.TestBase):
 
         self.assertIn("meow", "\n".join(stdout))
         self.assertEqual("", "\n".join(stderr))
+
+        # Status follows the process, rather than a polling timer
+        self.wait(timeout=100)
+        model = self.ctrl.models["commands"]
+        self.assertEqual("killed", model.items[0]["running"])
+        self.assertEqual(0, model.running_count())
+
+    def test_launch_batched_output(self):
+        """Test output lines are delivered in chunks"""
+        util.memory_repository({
+            "foo": {
+                "1": {
+                    "name": "foo",
+                    "version": "1",
+                    "requires": ["~app"],
+                }
+            },
+            "app": {
+                "1": {
+                    "name": "app",
+                    "version": "1",
+                }
+            },
+        })
+        self.ctrl_reset(["foo"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+
+        self.ctrl.select_application("app==1")
+
+        stdout = list()
+        command = (
+          '%s -c "'
+          'import sys;'
+          'sys.stdout.write(\'\\n\'.join(map(str, range(2000))))"'
+        ) % sys.executable
+
+        with self.wait_signal(self.ctrl.state_changed, "launching"):
+            self.ctrl.launch(command=command,
+                             stdout=lambda m: stdout.append(m))
+
+        commands = self.ctrl.state["commands"]
+        with self.wait_signal(commands[0].killed, timeout=5000):
+            pass
+
+        lines = "\n".join(stdout).splitlines()
+        self.assertEqual([str(i) for i in range(2000)], lines)
+        self.assertLess(len(stdout), 2000)
@@ -31,6 +31,26 @@ class TestProfiles(util.TestBase):
         self.assertEqual("bar", self.ctrl.state["profileName"])
         self.assertEqual(["foo", "bar"], list(self.ctrl.state["rezProfiles"]))
 
+    def test_reset_scan_progress(self):
+        """Test profile scanning progress is reported on reset
+        """
+        util.memory_repository({
+            "foo": {"1.0.0": {"name": "foo", "version": "1.0.0"}},
+            "bar": {"1.0.0": {"name": "bar", "version": "1.0.0"}},
+            "baz": {"1.0.0": {"name": "baz", "version": "1.0.0"}},
+        })
+        progress = []
+        self.ctrl.profiles_scanned.connect(
+            lambda scanned, total: progress.append((scanned, total)))
+
+        with self.wait_signal(self.ctrl.resetted):
+            self.ctrl.reset(["foo", "bar", "baz"])
+        self.wait(timeout=200)
+
+        self.assertEqual([(0, 3), (1, 3), (2, 3), (3, 3)], progress)
+        self.assertEqual(["foo", "bar", "baz"],
+                         list(self.ctrl.state["rezProfiles"]))
+
     def test_select_profile_with_out_apps(self):
         """Test selecting profile that has no apps
         """
@@ -106,6 +126,38 @@ class TestProfiles(util.TestBase):
             list(self.ctrl.state["rezApps"].keys())
         )
 
+    def test_select_profile_drops_stale_apps(self):
+        """Test only apps of the last selected profile are kept
+        """
+        util.memory_repository({
+            "foo": {
+                "1.0.0": {
+                    "name": "foo",
+                    "version": "1.0.0",
+                    "requires": ["~app_A"],
+                }
+            },
+            "bar": {
+                "1.0.0": {
+                    "name": "bar",
+                    "version": "1.0.0",
+                    "requires": ["~app_B"],
+                }
+            },
+            "app_A": {"1.0.0": {"name": "app_A", "version": "1.0.0"}},
+            "app_B": {"1.0.0": {"name": "app_B", "version": "1.0.0"}},
+        })
+        self.ctrl_reset(["foo", "bar"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+            self.ctrl.select_profile("bar")
+        self.wait(timeout=200)
+
+        self.assertEqual("bar", self.ctrl.state["profileName"])
+        self.assertEqual(["app_B==1.0.0"],
+                         list(self.ctrl.state["rezApps"].keys()))
+
     def test_profile_listing_without_root_err(self):
         """Listing profile without root will raise AssertionError"""
         self.assertRaises(AssertionError, self.ctrl.reset)
@@ -140,3 +192,279 @@ class TestProfiles(util.TestBase):
         expected = ["foo", "bar"]
         profiles = self.ctrl.list_profiles(expected + [None, ""])
         self.assertEqual(profiles, expected)
+
+    def test_repository_change_detected(self):
+        """Test clearing caches only reports changes to used families"""
+        from allzpark import control
+
+        packages = {
+            "foo": {
+                "1.0.0": {
+                    "name": "foo",
+                    "version": "1.0.0",
+                    "requires": ["~app_A"],
+                }
+            },
+            "app_A": {"1.0.0": {"name": "app_A", "version": "1.0.0"}},
+            "unrelated": {"1.0.0": {"name": "unrelated", "version": "1.0.0"}},
+        }
+        util.memory_repository(packages)
+        self.ctrl_reset(["foo"])
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("foo")
+        self.wait(timeout=200)
+
+        changed = []
+        self.ctrl.repository_changed.connect(changed.append)
+
+        def versions(family):
+            paths = tuple(self.ctrl._package_paths())
+            return [str(pkg.version)
+                    for pkg in control._find_family(family, None, paths)]
+
+        self.assertEqual(["1.0.0"], versions("unrelated"))
+
+        packages["unrelated"]["2.0.0"] = {"name": "unrelated",
+                                          "version": "2.0.0"}
+        util.memory_repository(packages)
+        self.ctrl.on_cache_timeout()
+        self.wait(timeout=200)
+        self.assertEqual([], changed)
+
+        # Listings of families outside of the profile are picked up too
+        self.assertEqual(["1.0.0", "2.0.0"], versions("unrelated"))
+
+        packages["app_A"]["2.0.0"] = {"name": "app_A", "version": "2.0.0"}
+        util.memory_repository(packages)
+
+        with self.wait_signal(self.ctrl.repository_changed):
+            self.ctrl.on_cache_timeout()
+
+        self.assertEqual([{"app_A"}], changed)
+
+    def test_repository_watcher(self):
+        """Test changes to watched families are reported once settled"""
+        import os
+        import shutil
+        import tempfile
+        from allzpark import control
+
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        for family in ("app_A", "unrelated"):
+            os.makedirs(os.path.join(root, family, "1.0.0"))
+
+        watcher = control.RepositoryWatcher(delay=100)
+        watcher.watch(watcher.directories(["app_A", "missing"], [root]))
+
+        changed = []
+        watcher.changed.connect(changed.append)
+
+        with self.wait_signal(watcher.changed, timeout=3000):
+            os.makedirs(os.path.join(root, "unrelated", "2.0.0"))
+            os.makedirs(os.path.join(root, "app_A", "2.0.0"))
+            os.makedirs(os.path.join(root, "app_A", "3.0.0"))
+
+        self.assertEqual([{"app_A"}], changed)
+
+    def test_favorites_prefetched(self):
+        """Test favorite profiles are loaded once idle, until interrupted"""
+        from allzpark import util as allzpark_util
+        from allzpark.vendor.Qt import QtCore, QtGui, QtWidgets
+
+        if not allzpark_util.USE_THREADING:
+            self.skipTest("Prefetching can't be interrupted without threading")
+
+        util.memory_repository({
+            "foo": {"1": {"name": "foo", "version": "1",
+                          "requires": ["~app_A"]}},
+            "bar": {"1": {"name": "bar", "version": "1",
+                          "requires": ["~app_A"]}},
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+        })
+        self.patch_allzparkconfig("prefetch_idle", 0.2)
+        self.patch_allzparkconfig("speculative_hover", 0)
+        self.ctrl.timers["prefetch"].setInterval(200)
+        self.ctrl.state.store("favoriteProfiles", "bar")
+        self.ctrl.state.store("startupProfile", "foo")
+        self.ctrl.state["profileName"] = "foo"
+
+        requests = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            requests.append(str(request[0]))
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+        self.ctrl_reset(["foo", "bar"])
+        self.assertEqual("foo", self.ctrl.state["profileName"])
+
+        # Keep busy
+        for _ in range(8):
+            QtWidgets.QApplication.sendEvent(self.window, QtGui.QKeyEvent(
+                QtCore.QEvent.KeyPress, QtCore.Qt.Key_Shift,
+                QtCore.Qt.NoModifier))
+            self.wait(100)
+
+        self.assertNotIn("bar-1", requests)
+
+        # Then leave it be
+        self.wait(1000)
+        self.assertIn("bar-1", requests)
+
+        del requests[:]
+
+        with self.wait_signal(self.ctrl.state_changed, "ready"):
+            self.ctrl.select_profile("bar")
+
+        self.assertEqual([], requests)
+        self.assertEqual(["app_A==1"], [
+            item["name"] for item in self.ctrl.models["apps"].items])
+
+    def test_profile_anticipated(self):
+        """Test selected profiles are loaded ahead of being activated"""
+        from allzpark import util as allzpark_util
+
+        if not allzpark_util.USE_THREADING:
+            self.skipTest("Loads finish before returning without threading")
+
+        packages = {
+            "app_A": {"1": {"name": "app_A", "version": "1"}},
+            "app_B": {"1": {"name": "app_B", "version": "1"}},
+        }
+        names = ["p%d" % index for index in range(4)]
+        for name in names:
+            packages[name] = {"1": {"name": name, "version": "1",
+                                    "requires": ["~app_A", "~app_B"]}}
+
+        util.memory_repository(packages)
+        self.patch_allzparkconfig("speculative_hover", 0)
+        self.ctrl.state["profileName"] = "p0"
+        self.ctrl_reset(names)
+
+        requests = []
+        env = self.ctrl.env
+
+        def record(request, *args, **kwargs):
+            requests.append(" ".join(map(str, request)))
+            return env(request, *args, **kwargs)
+
+        self.ctrl.env = record
+
+        # Scrolling past a few, only the last is loaded
+        for name in names[1:]:
+            self.ctrl.anticipate_profile(name)
+
+        self.wait(1000)
+
+        resolved = [request for request in requests if "app_" in request]
+        self.assertEqual(["p3-1 app_A==1", "p3-1 app_B==1"],
+                         sorted(request for request in resolved
+                                if request.startswith("p3")))
+
+        # At most the application resolving at the time was finished
+        for name in ("p1", "p2"):
+            self.assertLessEqual(len([request for request in resolved
+                                      if request.startswith(name)]), 1)
+
+        del requests[:]
+
+        # Clicked in the Profiles dock
+        view = self.window._docks["profiles"]._widgets["view"]
+        model = self.ctrl.models["profiles"]
+        view.clicked.emit(model.findIndex("p1"))
+
+        self.wait(1000)
+        self.assertIn("p1-1 app_A==1", requests)
+
+        del requests[:]
+
+        for name in ("p1", "p3"):
+            with self.wait_signal(self.ctrl.state_changed, "ready"):
+                self.ctrl.select_profile(name)
+
+        self.assertEqual([], requests)
+
+    def test_context_cache(self):
+        """Test stored contexts are re-used until a package is released"""
+        import os
+        import time
+        import shutil
+        import tempfile
+        from allzpark import control
+        from allzpark import _rezapi as rez
+
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        packages = os.path.join(root, "packages")
+
+        def release(name, version, mtime):
+            path = os.path.join(packages, name, version)
+            os.makedirs(path)
+
+            with open(os.path.join(path, "package.py"), "w") as f:
+                f.write("name = %r\nversion = %r\n" % (name, version))
+
+            os.utime(os.path.join(packages, name), (mtime, mtime))
+            rez.clear_caches()
+
+        before = time.time() - 100
+        release("app_A", "1", before)
+        release("lib", "1", before)
+
+        cache = control.ContextCache(os.path.join(root, "contexts"),
+                                     maxsize=2)
+        paths = [packages]
+
+        def resolve(requests):
+            key = cache.key(requests, paths)
+            context = cache.get(key, paths)
+
+            if context is None:
+                context = rez.env(requests, package_paths=paths)
+                cache.put(key, context, paths)
+
+            return key, context
+
+        key, context = resolve(["app_A"])
+        self.assertTrue(context.success)
+        self.assertIsNotNone(cache.get(key, paths))
+
+        # Releases of other families don't matter
+        release("lib", "2", time.time() + 100)
+        self.assertIsNotNone(cache.get(key, paths))
+
+        # Released after the context was stored
+        release("app_A", "2", time.time() + 100)
+        self.assertIsNone(cache.get(key, paths))
+        self.assertEqual([], os.listdir(os.path.join(root, "contexts")))
+
+    def test_context_cache_pruned(self):
+        """Test only the most recently used contexts are kept on disk"""
+        import os
+        import shutil
+        import tempfile
+        from allzpark import control
+
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        cache = control.ContextCache(root, maxsize=2)
+
+        for index, key in enumerate("abc"):
+            fname = os.path.join(root, key + ".rxt")
+            open(fname, "w").close()
+            os.utime(fname, (index, index))
+
+        cache._prune()
+        self.assertEqual(["b.rxt", "c.rxt"], sorted(os.listdir(root)))
+
+    def test_cache_timeout_stored(self):
+        """Test the stored cache timeout is read back as seconds"""
+        self.ctrl.state.store("clearCacheTimeout", "2")
+        self.ctrl.set_cache_timeout()
+
+        self.assertEqual(2000, self.ctrl.timers["clearCache"].interval())
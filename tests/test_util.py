@@ -0,0 +1,238 @@
+import time
+import unittest
+
+
+class TestCached(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        """Test least recently used values are evicted first
+        """
+        from allzpark import util
+
+        calls = []
+
+        @util.cached(maxsize=2)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        double(1)
+        double(2)
+        double(1)  # 2 is now least recently used
+        double(3)
+        double(1)
+        double(2)
+
+        self.assertEqual([1, 2, 3, 2], calls)
+        self.assertEqual(2, double.cache_info()["hits"])
+        self.assertEqual(2, double.cache_info()["size"])
+
+    def test_ttl_and_invalidation(self):
+        """Test values expire and are cleared on request
+        """
+        from allzpark import util
+
+        calls = []
+
+        @util.cached(ttl=0)
+        def expired(value):
+            calls.append(value)
+            return value
+
+        @util.cached
+        def kept(value):
+            calls.append(value)
+            return value
+
+        expired(1)
+        expired(1)
+        kept([1])  # Unhashable, never cached
+        kept([1])
+        kept(2)
+        kept(2)
+        self.assertEqual([1, 1, [1], [1], 2], calls)
+
+        util.clear_caches()
+        kept(2)
+        self.assertEqual([1, 1, [1], [1], 2, 2], calls)
+
+    def test_cleared_whilst_computing(self):
+        """Test values computed whilst being cleared aren't kept
+        """
+        from allzpark import util
+
+        calls = []
+
+        @util.cached
+        def stale(value):
+            calls.append(value)
+
+            if len(calls) == 1:
+                stale.cache_clear()
+
+            return value
+
+        stale(1)
+        stale(1)
+        stale(1)
+        self.assertEqual([1, 1], calls)
+
+
+class TestPool(unittest.TestCase):
+
+    def test_priority(self):
+        """Test queued calls start lowest priority first
+        """
+        import threading
+        from allzpark import util
+
+        if not util.USE_THREADING:
+            self.skipTest("Calls are made immediately without threading")
+
+        pool = util.Pool(workers=1)
+        started = threading.Event()
+        release = threading.Event()
+        order = []
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        pool.submit(block)
+        started.wait(5)
+
+        jobs = [
+            pool.submit(order.append, [name], priority=priority)
+            for name, priority in (("b", 2), ("a", 1), ("c", 3), ("d", 1))
+        ]
+
+        release.set()
+
+        for job in jobs:
+            job.result(5)
+
+        self.assertEqual(["a", "d", "b", "c"], order)
+
+    def test_map_key(self):
+        """Test map returns results in order, regardless of priority
+        """
+        from allzpark import util
+
+        pool = util.Pool(workers=1)
+        order = []
+
+        def double(value):
+            order.append(value)
+            return value * 2
+
+        results = pool.map(double, [1, 2, 3], key=lambda value: -value)
+
+        self.assertEqual([2, 4, 6], results)
+        self.assertEqual([3, 2, 1], order)
+
+    def test_map_nested(self):
+        """Test calls made from within the pool run on the calling thread
+        """
+        import threading
+        from allzpark import util
+
+        pool = util.Pool(workers=1)
+        threads = []
+
+        def inner(value):
+            threads.append(threading.current_thread())
+            return value * 2
+
+        def outer(values):
+            threads.append(threading.current_thread())
+            return pool.map(inner, values)
+
+        job = pool.submit(outer, [[1, 2]])
+
+        self.assertEqual([2, 4], job.result(5))
+        self.assertEqual(1, len(set(threads)))
+
+
+class TestLRU(unittest.TestCase):
+
+    def test_bounds(self):
+        """Test values are evicted by count and by cost
+        """
+        from allzpark import util
+
+        lru = util.LRU(maxsize=2, maxcost=10)
+        lru.put("a", 1, cost=4)
+        lru.put("b", 2, cost=4)
+        lru.get("a")  # b is now least recently used
+        lru.put("c", 3, cost=1)
+
+        self.assertNotIn("b", lru)
+        self.assertEqual(5, lru.cost())
+
+        lru.put("d", 4, cost=6)  # Exceeds cost, evicting a
+        self.assertEqual(["c", "d"], [key for key in "abcd" if key in lru])
+
+        lru.put("e", 5, cost=11)  # Too costly to keep at all
+        self.assertEqual(0, len(lru))
+        self.assertEqual(0, lru.cost())
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_shared(self):
+        """Test concurrent calls with the same key share one call
+        """
+        import threading
+        from allzpark import util
+
+        flight = util.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def target():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return object()
+
+        def call():
+            results.append(flight.do("key", target))
+
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        threads[0].start()
+        started.wait(5)
+
+        for thread in threads[1:]:
+            thread.start()
+
+        # Give the others a moment to join the call in flight
+        time.sleep(0.1)
+        release.set()
+
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(4, len(results))
+        self.assertEqual(1, len(set(map(id, results))))
+        self.assertEqual(0, len(flight))
+
+        # Once returned, the next call is made anew
+        flight.do("key", target)
+        self.assertEqual(2, len(calls))
+
+    def test_error(self):
+        """Test errors are raised, and don't stick around
+        """
+        from allzpark import util
+
+        flight = util.SingleFlight()
+
+        def fail():
+            raise ValueError("failed")
+
+        self.assertRaises(ValueError, flight.do, "key", fail)
+        self.assertEqual(0, len(flight))
+        self.assertEqual(1, flight.do("key", lambda: 1))
@@ -1,5 +1,6 @@
 
 import os
+import gc
 import time
 import unittest
 import contextlib
@@ -51,6 +52,12 @@ class TestBase(unittest.TestCase):
         self._restore_allzparkconfig()
         time.sleep(0.1)
 
+        # Delete now, rather than whenever the next test gets around to it
+        from allzpark.vendor.Qt import QtCore
+        QtCore.QCoreApplication.sendPostedEvents(
+            None, QtCore.QEvent.DeferredDelete)
+        gc.collect()
+
     def _restore_allzparkconfig(self):
         from allzpark import allzparkconfig
 